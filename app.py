@@ -10,8 +10,32 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import io
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, RandomForestRegressor, GradientBoostingRegressor
+import os
+import json
+import csv
+import codecs
+import errno
+import gzip
+import hashlib
+import threading
+import time
+import uuid
+import weakref
+import importlib
+import tempfile
+import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from openpyxl import load_workbook
+from scipy.cluster.hierarchy import linkage, leaves_list
+from scipy.spatial.distance import squareform
+from scipy.stats import loguniform, randint, uniform
+from sklearn.model_selection import train_test_split, KFold, StratifiedKFold, ParameterSampler
+from sklearn.ensemble import (
+    RandomForestClassifier, GradientBoostingClassifier, RandomForestRegressor, GradientBoostingRegressor,
+    HistGradientBoostingClassifier, HistGradientBoostingRegressor, IsolationForest
+)
 from sklearn.linear_model import LogisticRegression, LinearRegression, Ridge, Lasso
 from sklearn.svm import SVR
 from sklearn.metrics import (
@@ -19,10 +43,34 @@ from sklearn.metrics import (
     confusion_matrix, roc_curve, roc_auc_score, classification_report,
     mean_absolute_error, mean_squared_error, r2_score
 )
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
+from threadpoolctl import threadpool_limits
+import joblib
+from joblib import Parallel, delayed
 import warnings
 warnings.filterwarnings('ignore')
 
+# Copy-on-Write: frames derived from one another share buffers until one is mutated
+pd.set_option('mode.copy_on_write', True)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    pa = pq = None
+    HAS_PYARROW = False
+
+try:
+    import python_calamine  # noqa: F401
+    # pandas learned engine='calamine' in 2.2
+    HAS_CALAMINE = tuple(int(part) for part in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    HAS_CALAMINE = False
+
+# Streamlit 1.52 calls a download_button's data callable only when the button is clicked
+DEFERRED_DOWNLOADS = tuple(int(part) for part in st.__version__.split('.')[:2]) >= (1, 52)
+
 # ═══════════════════════════════════════════════════════════════════════════
 # 🎨 CUSTOM CSS INJECTION - CYBERPUNK FINTECH THEME
 # ═══════════════════════════════════════════════════════════════════════════
@@ -187,518 +235,3656 @@ def init_session_state():
         st.session_state.feature_names = None
     if 'target_name' not in st.session_state:
         st.session_state.target_name = None
-    if 'label_encoders' not in st.session_state:
-        st.session_state.label_encoders = {}
+    if 'encoder' not in st.session_state:
+        st.session_state.encoder = None
     if 'is_regression' not in st.session_state:
         st.session_state.is_regression = False
     if 'problem_type' not in st.session_state:
         st.session_state.problem_type = None
+    if 'cv_results' not in st.session_state:
+        st.session_state.cv_results = None
+    if 'model_fingerprint' not in st.session_state:
+        st.session_state.model_fingerprint = None
+    if 'model_token' not in st.session_state:
+        st.session_state.model_token = None
+    if 'evaluation' not in st.session_state:
+        st.session_state.evaluation = None
+    if 'dataset_fingerprint' not in st.session_state:
+        st.session_state.dataset_fingerprint = None
+    if 'cleaned_fingerprint' not in st.session_state:
+        st.session_state.cleaned_fingerprint = None
+    if 'cleaning_plan' not in st.session_state:
+        st.session_state.cleaning_plan = None
+    if 'training_job' not in st.session_state:
+        st.session_state.training_job = None
+    if 'training_job_frame' not in st.session_state:
+        st.session_state.training_job_frame = None
+    if 'tuning_results' not in st.session_state:
+        st.session_state.tuning_results = None
+    if 'race' not in st.session_state:
+        st.session_state.race = None
+    if 'scoring_job' not in st.session_state:
+        st.session_state.scoring_job = None
+    if 'scoring_result' not in st.session_state:
+        st.session_state.scoring_result = None
+    if 'core_budget' not in st.session_state:
+        st.session_state.core_budget = DEFAULT_CORE_BUDGET
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 📂 DATA INGESTION MODULE
+# 🧮 SESSION MEMORY ACCOUNTING
 # ═══════════════════════════════════════════════════════════════════════════
 
-def data_ingestion_page():
-    """Data upload and preview section"""
-    st.markdown('<h1 class="glow-text">📂 Data Ingestion Portal</h1>', unsafe_allow_html=True)
-    st.markdown("---")
-    
-    # File uploader
-    uploaded_file = st.file_uploader(
-        "🚀 Upload your dataset (CSV or Excel)",
-        type=['csv', 'xlsx'],
-        help="Drag and drop or click to upload"
-    )
+# buffer key -> (weakref to the owning base array, deep size) for object columns,
+# whose string payload is expensive to measure on every rerun
+_DEEP_NBYTES_MEMO = {}
+
+
+def _array_key(arr):
+    return ('ndarray', arr.__array_interface__['data'][0], arr.nbytes)
+
+
+def _object_column_nbytes(series, arr):
+    root = arr
+    while isinstance(root.base, np.ndarray):
+        root = root.base
+    key = _array_key(arr)
+    memo = _DEEP_NBYTES_MEMO.get(key)
+    if memo is not None and memo[0]() is root:
+        return memo[1]
+    nbytes = int(series.memory_usage(deep=True, index=False))
+    _DEEP_NBYTES_MEMO[key] = (weakref.ref(root, lambda _, key=key: _DEEP_NBYTES_MEMO.pop(key, None)), nbytes)
+    return nbytes
+
+
+def _column_buffers(series):
+    """(buffer_key, nbytes) pairs for the memory backing one column"""
+    values = series.array
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        categories = values.categories
+        return [
+            (_array_key(values.codes), values.codes.nbytes),
+            (('index', id(categories)), int(categories.memory_usage(deep=True))),
+        ]
+    if isinstance(series.dtype, np.dtype):
+        arr = series.to_numpy(copy=False)
+        nbytes = _object_column_nbytes(series, arr) if arr.dtype == object else arr.nbytes
+        return [(_array_key(arr), nbytes)]
+    return [(('extension', id(values)), int(series.memory_usage(deep=True, index=False)))]
+
+
+def _object_buffers(value):
+    """Buffers behind a DataFrame, Series or ndarray, or None for anything else"""
+    if isinstance(value, np.ndarray):
+        return [(_array_key(value), value.nbytes)]
+    if not isinstance(value, (pd.DataFrame, pd.Series)):
+        return None
     
-    if uploaded_file is not None:
-        try:
-            # Read file based on extension
-            if uploaded_file.name.endswith('.csv'):
-                # Try multiple encodings for CSV files
-                encodings = ['utf-8', 'latin-1', 'iso-8859-1', 'cp1252', 'utf-16']
-                df = None
-                successful_encoding = None
-                
-                for encoding in encodings:
-                    try:
-                        uploaded_file.seek(0)  # Reset file pointer
-                        df = pd.read_csv(uploaded_file, encoding=encoding)
-                        successful_encoding = encoding
-                        break
-                    except (UnicodeDecodeError, UnicodeError):
-                        continue
-                    except Exception as e:
-                        # If it's not an encoding error, break and show the error
-                        if df is None:
-                            raise e
-                        break
-                
-                if df is None:
-                    raise ValueError("Unable to read file with any supported encoding. Please check your file format.")
-                
-                if successful_encoding and successful_encoding != 'utf-8':
-                    st.info(f"📝 File loaded successfully with **{successful_encoding}** encoding")
-            else:
-                df = pd.read_excel(uploaded_file)
-            
-            st.session_state.df = df
-            st.session_state.cleaned_df = df.copy()
-            
-            # Success message
-            st.success(f"✅ Successfully loaded: **{uploaded_file.name}**")
-            
-            # Dataset shape metrics
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("📊 Total Rows", f"{df.shape[0]:,}")
-            with col2:
-                st.metric("📋 Total Columns", df.shape[1])
-            with col3:
-                st.metric("💾 Memory Usage", f"{df.memory_usage(deep=True).sum() / 1024:.2f} KB")
-            
-            st.markdown("---")
-            
-            # Data Preview
-            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-            st.markdown("### 🔍 Data Preview (First 10 Rows)")
-            st.dataframe(df.head(10), use_container_width=True)
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Column Type Detection
-            st.markdown("---")
-            st.markdown("### 🧬 Intelligent Column Analysis")
-            
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-                st.markdown("#### 🔢 Numeric Columns")
-                if numeric_cols:
-                    for col in numeric_cols:
-                        st.markdown(f"- `{col}` (Range: {df[col].min():.2f} → {df[col].max():.2f})")
-                else:
-                    st.info("No numeric columns detected")
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            with col2:
-                st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-                st.markdown("#### 🏷️ Categorical Columns")
-                if categorical_cols:
-                    for col in categorical_cols:
-                        unique_count = df[col].nunique()
-                        st.markdown(f"- `{col}` ({unique_count} unique values)")
-                else:
-                    st.info("No categorical columns detected")
-                st.markdown('</div>', unsafe_allow_html=True)
-            
-            # Missing Values Summary
-            st.markdown("---")
-            missing_data = df.isnull().sum()
-            if missing_data.sum() > 0:
-                st.warning(f"⚠️ Missing Values Detected: {missing_data.sum()} total")
-                missing_df = pd.DataFrame({
-                    'Column': missing_data[missing_data > 0].index,
-                    'Missing Count': missing_data[missing_data > 0].values,
-                    'Percentage': (missing_data[missing_data > 0].values / len(df) * 100).round(2)
-                })
-                st.dataframe(missing_df, use_container_width=True)
-            else:
-                st.success("✅ No missing values found!")
-                
-        except Exception as e:
-            st.error(f"❌ Error loading file: {str(e)}")
+    index = value.index
+    buffers = [(('index', id(index)), int(index.memory_usage(deep=True)))]
+    if isinstance(value, pd.Series):
+        buffers.extend(_column_buffers(value))
     else:
-        # Welcome screen
-        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-        st.markdown("""
-        ## 👋 Welcome to the AutoML Dashboard
-        
-        **Getting Started:**
-        1. 📤 Upload your CSV or Excel file using the uploader above
-        2. 📊 Explore your data with Advanced EDA
-        3. 🧹 Clean your data with one-click automation
-        4. 🧠 Train ML models without writing code
-        5. 🔮 Make predictions on new data
-        
-        **Supported File Types:**
-        - `.csv` (Comma-Separated Values)
-        - `.xlsx` (Microsoft Excel)
-        """)
-        st.markdown('</div>', unsafe_allow_html=True)
+        for position in range(value.shape[1]):
+            buffers.extend(_column_buffers(value.iloc[:, position]))
+    return buffers
+
+
+def session_memory_report(state=None):
+    """Logical vs. resident bytes of the data objects held in session state.
+    
+    Logical bytes count every frame in full; resident bytes count each shared
+    buffer once, which is what Copy-on-Write views actually cost.
+    """
+    state = st.session_state if state is None else state
+    logical = 0
+    objects = 0
+    resident = {}
+    for value in list(state.values()):
+        buffers = _object_buffers(value)
+        if buffers is None:
+            continue
+        objects += 1
+        for key, nbytes in buffers:
+            logical += nbytes
+            resident[key] = nbytes
+    return {'objects': objects, 'logical': logical, 'resident': sum(resident.values())}
 
 # ═══════════════════════════════════════════════════════════════════════════
-# 📊 ADVANCED EDA MODULE
+# 🗄️ DATASET CACHE
 # ═══════════════════════════════════════════════════════════════════════════
 
-def advanced_eda_page():
-    """Exploratory Data Analysis with interactive visualizations"""
-    st.markdown('<h1 class="glow-text">📊 Advanced Exploratory Data Analysis</h1>', unsafe_allow_html=True)
-    st.markdown("---")
+DATASET_CACHE_MB = int(os.environ.get("NOVACORE_DATASET_CACHE_MB", "2048"))
+
+
+def content_fingerprint(data):
+    """Content hash of raw upload bytes, combined with their size"""
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    return f"{digest}-{len(data)}"
+
+
+class DatasetCache:
+    """Process-wide LRU cache of parsed uploads, bounded by a memory budget"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return (df, meta) for a cached upload, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["df"], entry["meta"]
+
+    def put(self, key, df, meta):
+        """Store a parsed upload and evict least-recently-used entries over budget"""
+        nbytes = int(df.memory_usage(deep=True).sum())
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)["nbytes"]
+            if nbytes > self.max_bytes:
+                # Larger than the whole budget - don't thrash the cache for it
+                return
+            self._entries[key] = {"df": df, "meta": meta, "nbytes": nbytes}
+            self.current_bytes += nbytes
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted["nbytes"]
+                self.evictions += 1
+
+    def stats(self):
+        """Snapshot of cache counters"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "used_mb": self.current_bytes / 1024 ** 2,
+                "budget_mb": self.max_bytes / 1024 ** 2,
+            }
+
+
+@st.cache_resource
+def get_dataset_cache():
+    """Shared dataset cache for all sessions on this server"""
+    return DatasetCache(DATASET_CACHE_MB * 1024 ** 2)
+
+
+CSV_SNIFF_BYTES = 1024 * 1024
+CSV_DELIMITERS = ",;\t|"
+# C1 control range, printable only in cp1252
+CSV_C1_BYTES = bytes(range(0x80, 0xA0))
+
+
+def _detect_encoding(sample, is_complete):
+    """Pick an encoding from a byte prefix using BOMs, byte statistics and a trial decode"""
+    # Byte order marks are conclusive
+    if sample.startswith(b'\xef\xbb\xbf'):
+        return 'utf-8-sig', 1.0
+    if sample.startswith((b'\xff\xfe', b'\xfe\xff')):
+        return 'utf-16', 1.0
     
-    if st.session_state.df is None:
-        st.warning("⚠️ Please upload a dataset first in the Data Ingestion section!")
-        return
+    # BOM-less UTF-16: ASCII text leaves NUL bytes on every other position
+    if len(sample) >= 4:
+        even_nuls = sample[0::2].count(0) / len(sample[0::2])
+        odd_nuls = sample[1::2].count(0) / len(sample[1::2])
+        if odd_nuls > 0.3 and even_nuls < 0.05:
+            return 'utf-16-le', 0.9
+        if even_nuls > 0.3 and odd_nuls < 0.05:
+            return 'utf-16-be', 0.9
     
-    df = st.session_state.cleaned_df if st.session_state.cleaned_df is not None else st.session_state.df
+    # Trial decode; an incremental decoder tolerates a multi-byte char cut at the prefix edge
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=is_complete)
+        if is_complete or not sample.isascii():
+            return 'utf-8', 1.0
+        # Pure ASCII prefix - bytes past the sniff window could still be legacy 8-bit
+        return 'utf-8', 0.9
+    except UnicodeDecodeError:
+        pass
     
-    # Statistical Summary
-    st.markdown("### 📈 Statistical Summary")
-    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-    st.dataframe(df.describe(), use_container_width=True)
-    st.markdown('</div>', unsafe_allow_html=True)
+    # Legacy 8-bit: C1 control range 0x80-0x9F is printable only in cp1252
+    if sample.translate(None, CSV_C1_BYTES) != sample:
+        try:
+            sample.decode('cp1252')
+            return 'cp1252', 0.8
+        except UnicodeDecodeError:
+            pass
+    return 'latin-1', 0.7
+
+
+def _is_number(value):
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
+
+
+def sniff_csv_format(data, sample_bytes=CSV_SNIFF_BYTES):
+    """Detect encoding, delimiter and header row from a bounded prefix of a CSV upload"""
+    sample = data[:sample_bytes]
+    encoding, confidence = _detect_encoding(sample, is_complete=len(data) <= sample_bytes)
     
-    st.markdown("---")
+    text = sample.decode(encoding, errors='replace')
+    if len(data) > sample_bytes:
+        # Drop the trailing partial line so the sniffer sees whole records
+        text = text[:text.rfind('\n') + 1] or text
+    text = '\n'.join(text.splitlines()[:200])
     
-    # Dynamic Plotting Control Panel
-    st.markdown("### 🎨 Interactive Visualization Studio")
-    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    delimiter = ','
+    try:
+        delimiter = csv.Sniffer().sniff(text, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        pass
     
-    col1, col2, col3, col4 = st.columns(4)
+    # csv.Sniffer.has_header misfires on all-text tables, so only treat the file as
+    # headerless when every field of the first record is numeric
+    has_header = True
+    first_row = next(csv.reader([text.split('\n', 1)[0]], delimiter=delimiter), [])
+    if first_row and all(_is_number(field) for field in first_row):
+        has_header = False
     
-    with col1:
-        chart_type = st.selectbox(
-            "📊 Chart Type",
-            ["Scatter", "Line", "Bar", "3D Scatter", "Box", "Violin", "Histogram", "Density Heatmap", "Pie Chart", "Sunburst", "Treemap", "Funnel", "Area", "Bubble"],
-            help="Select visualization type"
-        )
+    return {
+        'encoding': encoding,
+        'confidence': confidence,
+        'delimiter': delimiter,
+        'header': 0 if has_header else None,
+    }
+
+
+def parse_uploaded_file(name, data, sheet_name=None):
+    """Parse raw upload bytes into a DataFrame, returning (df, format_info)"""
+    if name.endswith('.csv'):
+        fmt = sniff_csv_format(data)
+        try:
+            df = pd.read_csv(io.BytesIO(data), encoding=fmt['encoding'],
+                             sep=fmt['delimiter'], header=fmt['header'])
+        except UnicodeDecodeError:
+            # The sniff window was clean but a later byte was not - latin-1 decodes anything
+            fmt.update(encoding='latin-1', confidence=0.5)
+            df = pd.read_csv(io.BytesIO(data), encoding='latin-1',
+                             sep=fmt['delimiter'], header=fmt['header'])
+        return df, fmt
     
-    with col2:
-        x_axis = st.selectbox("🔵 X-Axis", df.columns.tolist())
+    return read_excel_sheet(data, sheet_name), None
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 💽 COLUMNAR DATASET STORE
+# ═══════════════════════════════════════════════════════════════════════════
+
+DATASET_STORE_DIR = os.environ.get(
+    "NOVACORE_STORE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "novacore", "datasets")
+)
+DATASET_STORE_MB = int(os.environ.get("NOVACORE_STORE_MB", "20480"))
+
+
+def derive_fingerprint(parent, step):
+    """Fingerprint of a dataset deterministically derived from another one"""
+    return hashlib.blake2b(f"{parent}|{step}".encode(), digest_size=16).hexdigest()
+
+
+class DatasetStore:
+    """On-disk Arrow IPC store keyed by dataset fingerprint.
     
-    with col3:
-        y_axis = st.selectbox("🟢 Y-Axis", df.columns.tolist())
+    Files are written uncompressed so reloads can memory-map them: numeric columns
+    come back zero-copy and their pages are shared through the OS page cache by
+    every session on the host. Oldest-used files are pruned over ``max_bytes``.
+    """
+
+    def __init__(self, root, max_bytes):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.enabled = HAS_PYARROW
+        if self.enabled:
+            os.makedirs(root, exist_ok=True)
+
+    def path_for(self, key):
+        return os.path.join(self.root, f"{key}.arrow")
+
+    def load(self, key):
+        """Memory-map a stored dataset, returning (df, meta) or None"""
+        path = self.path_for(key)
+        if not self.enabled or not os.path.exists(path):
+            return None
+        try:
+            table = pa.ipc.open_file(pa.memory_map(path, 'r')).read_all()
+            meta = json.loads(table.schema.metadata[b'novacore'])
+            df = table.to_pandas(split_blocks=True)
+        except Exception:
+            # Truncated or foreign file - treat as a miss and let the caller re-parse
+            return None
+        df.columns = pd.Index(meta.pop('columns'))
+        os.utime(path)
+        return df, meta
+
+    def save(self, key, df, meta):
+        """Persist a dataset; returns False when the frame can't be represented in Arrow"""
+        if not self.enabled:
+            return False
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            # Arrow needs string field names; the real labels travel in the metadata
+            positional = df.set_axis([f"c{i}" for i in range(df.shape[1])], axis=1)
+            table = pa.Table.from_pandas(positional)
+            payload = json.dumps({**meta, 'columns': df.columns.tolist()}, default=str)
+            table = table.replace_schema_metadata({**table.schema.metadata, b'novacore': payload.encode()})
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+        self.prune()
+        return True
+
+    def prune(self):
+        """Delete least-recently-used files until the store fits its budget"""
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith('.arrow'):
+                path = os.path.join(self.root, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+@st.cache_resource
+def get_dataset_store():
+    """Shared on-disk dataset store for all sessions on this server"""
+    return DatasetStore(DATASET_STORE_DIR, DATASET_STORE_MB * 1024 ** 2)
+
+
+def upload_fingerprint(uploaded_file):
+    """Content fingerprint of an upload, hashed once per uploaded file"""
+    file_id = getattr(uploaded_file, 'file_id', None)
+    memo = st.session_state.setdefault('_upload_fingerprints', {})
+    if file_id is not None and file_id in memo:
+        return memo[file_id]
+    key = content_fingerprint(uploaded_file.getvalue())
+    if file_id is not None:
+        memo.clear()
+        memo[file_id] = key
+    return key
+
+
+def dataset_key(fingerprint, sheet_name=None):
+    """Cache/store key for an upload, distinguishing workbook sheets"""
+    return fingerprint if sheet_name is None else derive_fingerprint(fingerprint, f"sheet:{sheet_name}")
+
+
+def load_uploaded_file(uploaded_file, sheet_name=None):
+    """Parse and compact an upload through the shared dataset cache.
     
-    with col4:
-        color_col = st.selectbox("🎨 Color (Hue)", [None] + df.columns.tolist())
+    Returns (df, meta, fingerprint), where meta holds the CSV ``format_info`` and the
+    ``memory_report`` of the dtype optimizer.
+    """
+    key = dataset_key(upload_fingerprint(uploaded_file), sheet_name)
+    cache = get_dataset_cache()
     
-    st.markdown('</div>', unsafe_allow_html=True)
+    cached = cache.get(key)
+    if cached is not None:
+        return cached[0], cached[1], key
     
-    # Use all data for accurate visualization
-    df_viz = df
+    # Second tier: a memory-mapped copy persisted by an earlier session
+    store = get_dataset_store()
+    stored = store.load(key)
+    if stored is not None:
+        df, meta = stored
+        cache.put(key, df, meta)
+        return df, meta, key
     
-    # Generate Plot
-    fig = None
-    try:
-        if chart_type == "Scatter":
-            fig = px.scatter(
-                df_viz, x=x_axis, y=y_axis, color=color_col,
-                template="plotly_dark",
-                color_continuous_scale="Viridis"
-            )
-        
-        elif chart_type == "Line":
-            fig = px.line(
-                df_viz, x=x_axis, y=y_axis, color=color_col,
-                template="plotly_dark"
-            )
-        
-        elif chart_type == "Bar":
-            # Check if we need aggregation
-            if df_viz[x_axis].dtype in ['object', 'category'] and df_viz[y_axis].dtype in ['int64', 'float64']:
-                # Aggregate for categorical x-axis
-                bar_data = df_viz.groupby(x_axis, as_index=False)[y_axis].sum()
-                fig = px.bar(bar_data, x=x_axis, y=y_axis, color=color_col, template="plotly_dark")
-            else:
-                fig = px.bar(df_viz, x=x_axis, y=y_axis, color=color_col, template="plotly_dark")
-        
-        elif chart_type == "3D Scatter":
-            if len(df.columns) >= 3:
-                z_axis = st.selectbox("🔴 Z-Axis", df.columns.tolist())
-                fig = px.scatter_3d(
-                    df_viz, x=x_axis, y=y_axis, z=z_axis, color=color_col,
-                    template="plotly_dark"
-                )
-            else:
-                st.error("❌ Need at least 3 columns for 3D plot")
-                return
-        
-        elif chart_type == "Box":
-            fig = px.box(
-                df_viz, x=x_axis, y=y_axis, color=color_col,
-                template="plotly_dark"
-            )
-        
-        elif chart_type == "Violin":
-            fig = px.violin(df_viz, x=x_axis, y=y_axis, color=color_col, template="plotly_dark")
-        
-        elif chart_type == "Histogram":
-            # Histogram only needs x-axis
-            fig = px.histogram(df_viz, x=x_axis, color=color_col, template="plotly_dark", marginal="box")
+    df, format_info = parse_uploaded_file(uploaded_file.name, uploaded_file.getvalue(), sheet_name)
+    df, memory_report = optimize_dtypes(df)
+    meta = {'format_info': format_info, 'memory_report': memory_report}
+    store.save(key, df, meta)
+    cache.put(key, df, meta)
+    return df, meta, key
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🗜️ MEMORY OPTIMIZER
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Text-like dtypes, including Arrow-backed strings produced by the optimizer
+CATEGORICAL_DTYPES = ['object', 'category', 'string']
+CATEGORY_MAX_RATIO = 0.5
+ARROW_STRINGS = os.environ.get("NOVACORE_ARROW_STRINGS", "0") == "1"
+
+
+def is_numeric_column(series):
+    """True for numeric (non-boolean) columns of any bit width"""
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)
+
+
+def _compact_column(series, category_ratio, arrow_strings):
+    """Return the smallest lossless representation of a column, or None to keep it"""
+    if pd.api.types.is_bool_dtype(series):
+        return None
+    
+    if pd.api.types.is_integer_dtype(series):
+        # Signed only - unsigned dtypes wrap around on subtraction downstream
+        downcast = pd.to_numeric(series, downcast='integer')
+        return downcast if downcast.dtype != series.dtype else None
+    
+    if pd.api.types.is_float_dtype(series):
+        if series.dtype.itemsize <= 4:
+            return None
+        downcast = series.astype('float32')
+        # Only keep float32 when every value survives the round trip exactly
+        exact = (downcast.astype(series.dtype) == series) | series.isna()
+        return downcast if exact.all() else None
+    
+    if series.dtype == object or pd.api.types.is_string_dtype(series):
+        n_rows = len(series)
+        if n_rows and series.nunique(dropna=True) / n_rows <= category_ratio:
+            return series.astype('category')
+        if arrow_strings and HAS_PYARROW and pd.api.types.infer_dtype(series, skipna=True) == 'string':
+            return series.astype('string[pyarrow]')
+    return None
+
+
+def optimize_dtypes(df, category_ratio=CATEGORY_MAX_RATIO, arrow_strings=ARROW_STRINGS):
+    """Downcast numerics and compact text columns without mutating ``df``.
+    
+    Returns (optimized_df, memory_report) where the report holds ``before`` and
+    ``after`` byte counts.
+    """
+    before = int(df.memory_usage(deep=True).sum())
+    optimized = df.copy(deep=False)
+    for col in df.columns:
+        compacted = _compact_column(df[col], category_ratio, arrow_strings)
+        if compacted is not None:
+            optimized[col] = compacted
+    after = int(optimized.memory_usage(deep=True).sum())
+    return optimized, {'before': before, 'after': after}
+
+
+def render_memory_metric(memory_report, label="💾 Memory Usage"):
+    """Show post-optimization memory with the saving as the metric delta"""
+    before, after = memory_report['before'], memory_report['after']
+    delta = None
+    if after < before:
+        delta = f"-{(before - after) / 1024:.2f} KB ({before / max(after, 1):.1f}x smaller)"
+    st.metric(label, f"{after / 1024:.2f} KB", delta=delta, delta_color="inverse")
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🌊 STREAMING INGESTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+STREAM_CHUNK_ROWS = 100_000
+STREAMING_THRESHOLD_MB = int(os.environ.get("NOVACORE_STREAMING_THRESHOLD_MB", "100"))
+UNIQUE_SKETCH_SIZE = 1024
+
+
+class StreamingProfiler:
+    """Incremental per-column statistics over a stream of DataFrame chunks.
+    
+    Distinct counts use a K-minimum-values sketch over 64-bit value hashes, so they
+    are exact up to ``sketch_size`` distinct values and approximate beyond that.
+    """
+
+    def __init__(self, sketch_size=UNIQUE_SKETCH_SIZE):
+        self.sketch_size = sketch_size
+        self.rows = 0
+        self.chunks = 0
+        self.memory_bytes = 0
+        self.columns = []
+        self.null_counts = pd.Series(dtype='int64')
+        self.mins = pd.Series(dtype='float64')
+        self.maxs = pd.Series(dtype='float64')
+        self._non_numeric = set()
+        self._categorical = set()
+        self._sketches = {}
+
+    def update(self, chunk):
+        """Fold one chunk into the running statistics"""
+        if not self.columns:
+            self.columns = chunk.columns.tolist()
+        self.rows += len(chunk)
+        self.chunks += 1
+        self.memory_bytes += int(chunk.memory_usage(deep=True).sum())
+        self.null_counts = self.null_counts.add(chunk.isnull().sum(), fill_value=0).astype('int64')
         
-        elif chart_type == "Density Heatmap":
-            # Both axes must be numeric
-            if df_viz[x_axis].dtype not in ['int64', 'float64'] or df_viz[y_axis].dtype not in ['int64', 'float64']:
-                st.error("❌ Density Heatmap requires both X and Y axes to be numeric")
-                return
-            fig = px.density_heatmap(df_viz, x=x_axis, y=y_axis, template="plotly_dark", color_continuous_scale="Purples")
+        numeric = chunk.select_dtypes(include=[np.number])
+        self._non_numeric.update(set(chunk.columns) - set(numeric.columns))
+        self._categorical.update(chunk.select_dtypes(include=CATEGORICAL_DTYPES).columns)
+        if len(numeric.columns):
+            # NaN-aware running min/max across chunks in one vectorized step per chunk
+            self.mins = pd.concat([self.mins, numeric.min()], axis=1).min(axis=1)
+            self.maxs = pd.concat([self.maxs, numeric.max()], axis=1).max(axis=1)
         
-        elif chart_type == "Pie Chart":
-            # Validate: x_axis = category, y_axis = numeric
-            if df_viz[y_axis].dtype not in ['int64', 'float64']:
-                st.error(f"❌ Pie chart Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
+        for col in chunk.columns:
+            self._update_sketch(col, chunk[col])
+
+    def _update_sketch(self, col, series):
+        hashes = pd.util.hash_pandas_object(series.dropna(), index=False).to_numpy()
+        sketch = self._sketches.get(col)
+        if sketch is not None and len(sketch) == self.sketch_size:
+            # Only hashes below the current k-th minimum can enter the sketch
+            hashes = hashes[hashes < sketch[-1]]
+            if not len(hashes):
                 return
-            # Aggregate and limit to top 20 categories
-            pie_data = df_viz.groupby(x_axis, as_index=False)[y_axis].sum().nlargest(20, y_axis)
-            fig = px.pie(pie_data, names=x_axis, values=y_axis, template="plotly_dark", 
-                        color_discrete_sequence=px.colors.sequential.Purp,
-                        title=f"Top 20 {x_axis} by {y_axis}")
-        
-        elif chart_type == "Sunburst":
-            if df_viz[y_axis].dtype not in ['int64', 'float64']:
-                st.error(f"❌ Sunburst Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
-                return
-            # Aggregate and limit
-            sun_data = df_viz.groupby(x_axis, as_index=False)[y_axis].sum().nlargest(30, y_axis)
-            fig = px.sunburst(sun_data, path=[x_axis], values=y_axis, template="plotly_dark",
-                            color_discrete_sequence=px.colors.sequential.Purp)
-        
-        elif chart_type == "Treemap":
-            if df_viz[y_axis].dtype not in ['int64', 'float64']:
-                st.error(f"❌ Treemap Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
-                return
-            # Aggregate and limit
-            tree_data = df_viz.groupby(x_axis, as_index=False)[y_axis].sum().nlargest(30, y_axis)
-            fig = px.treemap(tree_data, path=[x_axis], values=y_axis, template="plotly_dark",
-                           color_discrete_sequence=px.colors.sequential.Purp)
-        
-        elif chart_type == "Funnel":
-            if df_viz[y_axis].dtype not in ['int64', 'float64']:
-                st.error(f"❌ Funnel Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
-                return
-            # Aggregate
-            funnel_data = df_viz.groupby(x_axis, as_index=False)[y_axis].sum().sort_values(y_axis, ascending=False)
-            fig = px.funnel(funnel_data, x=y_axis, y=x_axis, template="plotly_dark")
-        
-        elif chart_type == "Area":
-            fig = px.area(df_viz, x=x_axis, y=y_axis, color=color_col, template="plotly_dark")
-        
-        elif chart_type == "Bubble":
-            numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-            if len(numeric_cols) < 2:
-                st.error("❌ Bubble chart requires at least 2 numeric columns")
-                return
-            size_col = st.selectbox("🔵 Bubble Size", numeric_cols)
-            fig = px.scatter(df_viz, x=x_axis, y=y_axis, size=size_col, color=color_col, 
-                           template="plotly_dark", size_max=60)
-        
-        # Update layout with cyberpunk theme
-        if fig:
-            fig.update_layout(
-                plot_bgcolor='#0E1117',
-                paper_bgcolor='#0E1117',
-                font=dict(color='#FAFAFA'),
-                title=dict(
-                    text=f"{chart_type}: {y_axis} vs {x_axis}" if chart_type != "Histogram" else f"{chart_type}: {x_axis}",
-                    font=dict(size=20, color='#8B5CF6')
-                )
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+        merged = hashes if sketch is None else np.concatenate([sketch, hashes])
+        self._sketches[col] = np.unique(merged)[:self.sketch_size]
+
+    def approx_unique(self, col):
+        """Estimated number of distinct non-null values in a column"""
+        sketch = self._sketches.get(col)
+        if sketch is None:
+            return 0
+        if len(sketch) < self.sketch_size:
+            return len(sketch)
+        return int((self.sketch_size - 1) * 2.0 ** 64 / float(sketch[-1]))
+
+    @property
+    def numeric_columns(self):
+        return [col for col in self.columns if col not in self._non_numeric]
+
+    @property
+    def categorical_columns(self):
+        return [col for col in self.columns if col in self._categorical]
+
+    def numeric_ranges(self):
+        return {col: (self.mins.get(col, np.nan), self.maxs.get(col, np.nan)) for col in self.numeric_columns}
+
+    def categorical_uniques(self):
+        return {col: self.approx_unique(col) for col in self.categorical_columns}
+
+
+def stream_csv_chunks(data, format_info, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield (chunk, fraction_read) from CSV bytes without materializing the whole frame"""
+    buffer = io.BytesIO(data)
+    reader = pd.read_csv(buffer, chunksize=chunk_rows, encoding=format_info['encoding'],
+                         sep=format_info['delimiter'], header=format_info['header'])
+    with reader:
+        for chunk in reader:
+            yield chunk, min(buffer.tell() / max(len(data), 1), 1.0)
+
+
+def profile_chunks(chunks, on_chunk=None):
+    """Fold a (chunk, progress) stream into a profiler, returning (preview, profiler)"""
+    profiler = StreamingProfiler()
+    preview = None
+    for chunk, progress in chunks:
+        if preview is None:
+            preview = chunk.head(10)
+        profiler.update(chunk)
+        if on_chunk is not None:
+            on_chunk(preview, profiler, progress)
+    return preview, profiler
+
+
+def profile_csv_stream(data, on_chunk=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Profile a CSV upload chunk by chunk, returning (preview, profiler, format_info)"""
+    format_info = sniff_csv_format(data)
+    while True:
+        try:
+            preview, profiler = profile_chunks(stream_csv_chunks(data, format_info, chunk_rows), on_chunk)
+            return preview, profiler, format_info
+        except UnicodeDecodeError:
+            if format_info['encoding'] == 'latin-1':
+                raise
+            # Same fallback as the full parse: latin-1 decodes any byte sequence
+            format_info.update(encoding='latin-1', confidence=0.5)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📗 EXCEL READER
+# ═══════════════════════════════════════════════════════════════════════════
+
+EXCEL_ENGINE = 'calamine' if HAS_CALAMINE else 'openpyxl'
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def list_excel_sheets(fingerprint, _data):
+    """Sheet names of a workbook, read from its index without loading any cells"""
+    workbook = load_workbook(io.BytesIO(_data), read_only=True)
+    try:
+        return workbook.sheetnames
+    finally:
+        workbook.close()
+
+
+def read_excel_sheet(data, sheet_name=None):
+    """Parse one sheet (the first by default) with the fastest installed engine"""
+    return pd.read_excel(io.BytesIO(data), sheet_name=sheet_name or 0, engine=EXCEL_ENGINE)
+
+
+def _excel_header(values):
+    """Column labels for a header row, matching pandas' Unnamed/duplicate naming"""
+    names = []
+    seen = {}
+    for position, value in enumerate(values):
+        name = f"Unnamed: {position}" if value is None else value
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name)
+    return names
+
+
+def stream_excel_chunks(data, sheet_name=None, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield (chunk, fraction_read) from one sheet via openpyxl's read-only row stream.
+    
+    Only the used range is materialized: trailing empty columns are cut at the
+    header width and trailing empty rows are never emitted.
+    """
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        total_rows = sheet.max_row or 0
+        rows = sheet.iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        width = max((i + 1 for i, value in enumerate(header) if value is not None), default=0)
+        columns = _excel_header(header[:width])
         
-    except Exception as e:
-        st.error(f"❌ Error creating plot: {str(e)}")
-        st.info("💡 Tip: Make sure you select appropriate column types for this chart")
+        buffer = []
+        pending_blank = []
+        rows_read = 1
+        for row in rows:
+            rows_read += 1
+            row = tuple(row[:width]) + (None,) * (width - len(row))
+            if all(value is None for value in row):
+                # Interior blank rows are kept and trailing ones dropped, exactly as pd.read_excel does
+                pending_blank.append(row)
+                continue
+            buffer.extend(pending_blank)
+            pending_blank = []
+            buffer.append(row)
+            if len(buffer) >= chunk_rows:
+                chunk = pd.DataFrame.from_records(buffer, columns=columns).infer_objects()
+                buffer = []
+                yield chunk, min(rows_read / total_rows, 1.0) if total_rows else 0.0
+        if buffer:
+            yield pd.DataFrame.from_records(buffer, columns=columns).infer_objects(), 1.0
+    finally:
+        workbook.close()
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🔬 COLUMN PROFILING ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+# Numeric columns are profiled in blocks to bound the float64 working copy
+PROFILE_BLOCK_COLUMNS = 64
+DESCRIBE_INDEX = ['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+
+def _describe_numeric(numeric):
+    """df.describe() for numeric columns, computed with NumPy over column blocks"""
+    blocks = []
+    with warnings.catch_warnings(), np.errstate(all='ignore'):
+        warnings.simplefilter('ignore', RuntimeWarning)
+        for start in range(0, numeric.shape[1], PROFILE_BLOCK_COLUMNS):
+            block = numeric.iloc[:, start:start + PROFILE_BLOCK_COLUMNS]
+            values = block.to_numpy(dtype='float64', na_value=np.nan)
+            count = (~np.isnan(values)).sum(axis=0)
+            quantiles = np.nanpercentile(values, [0, 25, 50, 75, 100], axis=0)
+            stats = np.vstack([
+                count,
+                np.nanmean(values, axis=0),
+                np.nanstd(values, axis=0, ddof=1),
+                quantiles,
+            ])
+            blocks.append(pd.DataFrame(stats, index=DESCRIBE_INDEX, columns=block.columns))
+    return pd.concat(blocks, axis=1)
+
+
+def compute_profile(df):
+    """All per-column statistics the pages need, one vectorized pass per dtype group"""
+    numeric = df.select_dtypes(include=[np.number])
+    categorical = df.select_dtypes(include=CATEGORICAL_DTYPES)
+    describe = _describe_numeric(numeric) if numeric.shape[1] else df.describe()
+    return {
+        'n_rows': len(df),
+        'n_cols': df.shape[1],
+        'numeric_cols': numeric.columns.tolist(),
+        'categorical_cols': categorical.columns.tolist(),
+        'nulls': df.isnull().sum(),
+        'describe': describe,
+        'nunique': categorical.nunique(),
+    }
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_profile(fingerprint, _df):
+    return compute_profile(_df)
+
+
+def get_dataset_profile(df, fingerprint):
+    """Profile of a dataset, cached by fingerprint across reruns, pages and sessions"""
+    if fingerprint is None:
+        return compute_profile(df)
+    return _cached_profile(fingerprint, df)
+
+
+def active_dataset():
+    """The frame analysis pages work on (cleaned when available) and its fingerprint"""
+    if st.session_state.cleaned_df is not None:
+        return st.session_state.cleaned_df, st.session_state.cleaned_fingerprint
+    return st.session_state.df, st.session_state.dataset_fingerprint
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🎯 RENDER BUDGET
+# ═══════════════════════════════════════════════════════════════════════════
+
+RENDER_BUDGET_POINTS = int(os.environ.get("NOVACORE_RENDER_POINTS", "20000"))
+LINE_BUDGET_POINTS = 5000
+# Color groups beyond this many (by size) are downsampled together as one "other" group
+LINE_MAX_GROUPS = 20
+# Scatters this many times over budget are drawn as a binned density instead
+DENSITY_FALLBACK_FACTOR = 25
+DENSITY_BINS = 100
+SAMPLE_GRID_BINS = 64
+# Grid cells holding this few points are outliers and always survive sampling
+SPARSE_CELL_POINTS = 2
+MIN_GROUP_POINTS = 50
+
+
+def _numeric_axis(series):
+    """Float view of a numeric or datetime axis, or None for categorical axes"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        values = series.to_numpy(dtype='datetime64[ns]').astype('int64').astype('float64')
+        values[series.isna().to_numpy()] = np.nan
+        return values
+    if is_numeric_column(series):
+        return series.to_numpy(dtype='float64', na_value=np.nan)
+    return None
+
+
+def _grid_codes(series, bins=SAMPLE_GRID_BINS):
+    """Bin index of every value along one axis (categories map to their own code)"""
+    values = _numeric_axis(series)
+    if values is None:
+        return pd.factorize(series)[0] + 1
+    finite = np.isfinite(values)
+    if not finite.any():
+        return np.zeros(len(values), dtype='int64')
+    lo, hi = values[finite].min(), values[finite].max()
+    scale = (bins - 1) / (hi - lo) if hi > lo else 0.0
+    codes = np.zeros(len(values), dtype='int64')
+    codes[finite] = ((values[finite] - lo) * scale).astype('int64') + 1
+    return codes
+
+
+def budget_sample_positions(df, budget, x=None, y=None, color=None, seed=42):
+    """Row positions for a density-preserving, color-stratified sample of ``df``.
     
-    # Correlation Matrix
-    st.markdown("---")
-    st.markdown("### 🔥 Correlation Heatmap")
+    Points in sparse grid cells (outliers) are always kept. The remaining budget
+    is split across color groups proportionally, with a floor so small classes
+    stay visible, and filled uniformly at random within each group so the
+    relative point density of the full data is preserved.
+    """
+    n_rows = len(df)
+    if n_rows <= budget:
+        return np.arange(n_rows)
+    rng = np.random.default_rng(seed)
+    keep = np.zeros(n_rows, dtype=bool)
     
-    numeric_df = df.select_dtypes(include=[np.number])
-    if len(numeric_df.columns) > 1:
-        corr_matrix = numeric_df.corr()
-        
-        fig = go.Figure(data=go.Heatmap(
-            z=corr_matrix.values,
-            x=corr_matrix.columns,
-            y=corr_matrix.columns,
-            colorscale='Purples',
-            text=corr_matrix.values.round(2),
-            texttemplate='%{text}',
-            textfont={"size": 10},
-            colorbar=dict(title="Correlation")
-        ))
-        
-        fig.update_layout(
-            template="plotly_dark",
-            title="Feature Correlation Matrix",
-            plot_bgcolor='#0E1117',
-            paper_bgcolor='#0E1117',
-            font=dict(color='#FAFAFA'),
-            width=800,
-            height=800
+    if x is not None and y is not None:
+        cells = _grid_codes(df[x]) * (SAMPLE_GRID_BINS + 2) + _grid_codes(df[y])
+        _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+        sparse = counts[inverse] <= SPARSE_CELL_POINTS
+        if sparse.sum() <= budget // 10:
+            keep |= sparse
+    
+    candidates = np.flatnonzero(~keep)
+    remaining = budget - int(keep.sum())
+    if color is not None and not is_numeric_column(df[color]):
+        groups = pd.factorize(df[color].iloc[candidates])[0] + 1
+    else:
+        groups = np.zeros(len(candidates), dtype='int64')
+    sizes = np.bincount(groups)
+    quotas = np.maximum(
+        np.floor(sizes * remaining / max(len(candidates), 1)),
+        np.minimum(sizes, MIN_GROUP_POINTS)
+    )
+    
+    # Random rank of every candidate within its group, then take the first `quota`
+    order = rng.permutation(len(candidates))
+    ranks = pd.Series(groups[order]).groupby(groups[order]).cumcount().to_numpy()
+    chosen = candidates[order[ranks < quotas[groups[order]]]]
+    keep[chosen] = True
+    return np.flatnonzero(keep)
+
+
+def lttb_positions(x, y, n_out):
+    """Largest-Triangle-Three-Buckets downsampling of a series sorted by x"""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype('int64')
+    selected = np.empty(n_out, dtype='int64')
+    selected[0] = 0
+    selected[-1] = n - 1
+    anchor = 0
+    for bucket in range(n_out - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        if bucket + 2 < len(edges):
+            next_x = x[end:edges[bucket + 2]].mean() if edges[bucket + 2] > end else x[end]
+            next_y = y[end:edges[bucket + 2]].mean() if edges[bucket + 2] > end else y[end]
+        else:
+            next_x, next_y = x[-1], y[-1]
+        area = np.abs(
+            (x[anchor] - next_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (next_y - y[anchor])
         )
-        
-        st.plotly_chart(fig, use_container_width=True)
+        anchor = start + int(np.argmax(area))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def line_sample_positions(df, budget, x, y, color=None):
+    """Row positions (in x order) for LTTB-downsampled line/area traces, per color group.
+    
+    Numeric colors are sampled as a single group, and categorical colors keep
+    their ``LINE_MAX_GROUPS`` largest groups; at most ``budget`` rows are returned.
+    """
+    x_values = _numeric_axis(df[x])
+    y_values = _numeric_axis(df[y])
+    if x_values is None or y_values is None:
+        # Categorical axis: no geometry to preserve, fall back to an even stride
+        return np.linspace(0, len(df) - 1, min(budget, len(df))).astype('int64')
+    
+    valid = np.flatnonzero(np.isfinite(x_values) & np.isfinite(y_values))
+    if color is not None and not is_numeric_column(df[color]):
+        groups = pd.factorize(df[color].iloc[valid])[0] + 1
+        # Rank groups by size and fold the long tail into one "other" group
+        ranking = np.argsort(-np.bincount(groups), kind='stable')
+        rank_of = np.empty_like(ranking)
+        rank_of[ranking] = np.arange(len(ranking))
+        groups = np.minimum(rank_of[groups], LINE_MAX_GROUPS)
     else:
-        st.info("ℹ️ Need at least 2 numeric columns for correlation analysis")
+        groups = np.zeros(len(valid), dtype='int64')
     
-    # Distribution Analysis
+    positions = []
+    for group in np.unique(groups):
+        members = valid[groups == group]
+        members = members[np.argsort(x_values[members], kind='stable')]
+        share = max(int(budget * len(members) / max(len(valid), 1)), 3)
+        picked = lttb_positions(x_values[members], y_values[members], share)
+        positions.append(members[picked])
+    if not positions:
+        return valid
+    positions = np.concatenate(positions)
+    positions = positions[np.argsort(x_values[positions], kind='stable')]
+    if len(positions) > budget:
+        # Per-group floors of 3 points can overshoot the budget by a few rows
+        positions = positions[np.linspace(0, len(positions) - 1, budget).astype('int64')]
+    return positions
+
+
+def compute_render_positions(df, kind, x, y, color, budget):
+    if kind == 'line':
+        return line_sample_positions(df, budget, x, y, color)
+    return budget_sample_positions(df, budget, x, y, color)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_render_positions(fingerprint, kind, x, y, color, budget, _df):
+    return compute_render_positions(_df, kind, x, y, color, budget)
+
+
+def render_subset(df, fingerprint, kind, x, y, color=None, budget=RENDER_BUDGET_POINTS):
+    """Rows of ``df`` to send to the browser for a chart; cached per dataset and axes"""
+    if len(df) <= budget:
+        return df
+    if fingerprint is None:
+        positions = compute_render_positions(df, kind, x, y, color, budget)
+    else:
+        positions = _cached_render_positions(fingerprint, kind, x, y, color, budget, df)
+    return df.iloc[positions]
+
+
+def density_heatmap_figure(df, x, y, bins=DENSITY_BINS):
+    """2D histogram binned server-side, so only the grid travels to the browser"""
+    x_values = df[x].to_numpy(dtype='float64', na_value=np.nan)
+    y_values = df[y].to_numpy(dtype='float64', na_value=np.nan)
+    finite = np.isfinite(x_values) & np.isfinite(y_values)
+    counts, x_edges, y_edges = np.histogram2d(x_values[finite], y_values[finite], bins=bins)
+    fig = go.Figure(data=go.Heatmap(
+        z=counts.T,
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        colorscale='Purples',
+        colorbar=dict(title="Count")
+    ))
+    fig.update_layout(template="plotly_dark", xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def add_render_note(fig, shown, total, method):
+    """Annotate a chart with how many of the dataset's points it actually draws"""
+    if shown >= total:
+        return
+    fig.add_annotation(
+        text=f"Showing {shown:,} of {total:,} points · {method}",
+        xref='paper', yref='paper', x=1, y=1.06, xanchor='right', showarrow=False,
+        font=dict(size=12, color='#00C9FF')
+    )
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🧊 AGGREGATION CACHE
+# ═══════════════════════════════════════════════════════════════════════════
+
+AGGREGATED_CHARTS = ["Bar", "Pie Chart", "Sunburst", "Treemap", "Funnel"]
+AGGREGATIONS = ['sum', 'mean', 'median', 'count', 'min', 'max']
+
+
+def aggregate_by(df, keys, value, agg='sum'):
+    """One groupby over all key levels; unobserved category combinations are skipped"""
+    return df.groupby(list(keys), as_index=False, observed=True, sort=False)[value].agg(agg)
+
+
+@st.cache_data(max_entries=128, show_spinner=False)
+def _cached_aggregate(fingerprint, keys, value, agg, _df):
+    return aggregate_by(_df, keys, value, agg)
+
+
+def get_aggregate(df, fingerprint, keys, value, agg='sum'):
+    """Group-by result cached by (dataset, keys, value, aggregation), shared by all chart types"""
+    keys = tuple(keys)
+    if fingerprint is None:
+        return aggregate_by(df, keys, value, agg)
+    return _cached_aggregate(fingerprint, keys, value, agg, df)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🔗 CORRELATION ENGINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+CORR_METHODS = ['pearson', 'spearman', 'kendall']
+CORR_BLOCK_COLUMNS = 256
+CORR_SAMPLE_ROWS = 200_000
+# Kendall's tau is O(n²) per pair, so it always runs on a row sample
+KENDALL_MAX_ROWS = 5_000
+CORR_ANNOTATION_MAX = 30
+CORR_FULL_MATRIX_MAX = 60
+
+
+def _blocked_pearson(values, columns):
+    """Pearson matrix as blocked Z-score products; ``values`` is consumed in place"""
+    with np.errstate(all='ignore'):
+        values -= values.mean(axis=0)
+        values /= np.sqrt((values ** 2).sum(axis=0))
+        n_cols = values.shape[1]
+        corr = np.empty((n_cols, n_cols))
+        for start in range(0, n_cols, CORR_BLOCK_COLUMNS):
+            stop = start + CORR_BLOCK_COLUMNS
+            corr[start:stop] = values[:, start:stop].T @ values
+    np.clip(corr, -1.0, 1.0, out=corr)
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def compute_correlation(df, method='pearson', max_rows=None, seed=42):
+    """Correlation of the numeric columns, optionally on a row sample.
+    
+    Complete data goes through BLAS in column blocks (ranks first for Spearman);
+    data with missing values keeps pandas' pairwise-complete semantics.
+    """
+    numeric = df.select_dtypes(include=[np.number])
+    if method == 'kendall':
+        max_rows = min(max_rows or KENDALL_MAX_ROWS, KENDALL_MAX_ROWS)
+    if max_rows and len(numeric) > max_rows:
+        numeric = numeric.sample(n=max_rows, random_state=seed)
+    
+    if method == 'kendall' or numeric.isnull().to_numpy().any():
+        return numeric.corr(method=method)
+    if method == 'spearman':
+        numeric = numeric.rank()
+    return _blocked_pearson(numeric.to_numpy(dtype='float64', copy=True), numeric.columns)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_correlation(fingerprint, method, max_rows, _df):
+    return compute_correlation(_df, method, max_rows)
+
+
+def get_correlation(df, fingerprint, method='pearson', max_rows=None):
+    """Correlation matrix cached by (dataset fingerprint, method, row sample)"""
+    if fingerprint is None:
+        return compute_correlation(df, method, max_rows)
+    return _cached_correlation(fingerprint, method, max_rows, df)
+
+
+def top_correlated_pairs(corr, k):
+    """The k feature pairs with the largest absolute correlation"""
+    values = corr.to_numpy()
+    rows, cols = np.triu_indices_from(values, k=1)
+    pair_values = values[rows, cols]
+    valid = np.flatnonzero(~np.isnan(pair_values))
+    order = valid[np.argsort(-np.abs(pair_values[valid]), kind='stable')[:k]]
+    return pd.DataFrame({
+        'Feature A': corr.columns[rows[order]],
+        'Feature B': corr.columns[cols[order]],
+        'Correlation': pair_values[order].round(4),
+    })
+
+
+def cluster_order(corr):
+    """Column order from average-linkage clustering on 1 - |r|, so related features sit together"""
+    if len(corr) < 3:
+        return list(corr.columns)
+    distance = 1 - np.abs(np.nan_to_num(corr.to_numpy(), nan=0.0))
+    np.fill_diagonal(distance, 0.0)
+    tree = linkage(squareform(np.clip(distance, 0, None), checks=False), method='average')
+    return list(corr.columns[leaves_list(tree)])
+
+
+def correlation_heatmap(corr, title):
+    """Heatmap of a correlation matrix; cell labels are dropped once they would clutter"""
+    annotate = len(corr) <= CORR_ANNOTATION_MAX
+    fig = go.Figure(data=go.Heatmap(
+        z=corr.values,
+        x=corr.columns,
+        y=corr.columns,
+        colorscale='Purples',
+        zmin=-1,
+        zmax=1,
+        text=corr.values.round(2) if annotate else None,
+        texttemplate='%{text}' if annotate else None,
+        textfont={"size": 10},
+        colorbar=dict(title="Correlation")
+    ))
+    
+    fig.update_layout(
+        template="plotly_dark",
+        title=title,
+        plot_bgcolor='#0E1117',
+        paper_bgcolor='#0E1117',
+        font=dict(color='#FAFAFA'),
+        width=800,
+        height=800
+    )
+    return fig
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📂 DATA INGESTION MODULE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def render_column_analysis(numeric_ranges, categorical_uniques, approximate=False):
+    """Render the numeric/categorical column cards from precomputed statistics"""
     st.markdown("---")
-    st.markdown("### 📊 Distribution Analysis")
+    st.markdown("### 🧬 Intelligent Column Analysis")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        st.markdown("#### 🔢 Numeric Columns")
+        if numeric_ranges:
+            for col, (col_min, col_max) in numeric_ranges.items():
+                st.markdown(f"- `{col}` (Range: {col_min:.2f} → {col_max:.2f})")
+        else:
+            st.info("No numeric columns detected")
+        st.markdown('</div>', unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        st.markdown("#### 🏷️ Categorical Columns")
+        if categorical_uniques:
+            prefix = "~" if approximate else ""
+            for col, unique_count in categorical_uniques.items():
+                st.markdown(f"- `{col}` ({prefix}{unique_count} unique values)")
+        else:
+            st.info("No categorical columns detected")
+        st.markdown('</div>', unsafe_allow_html=True)
+
+
+def render_missing_summary(missing_data, n_rows):
+    """Render the missing-values summary from per-column null counts"""
+    st.markdown("---")
+    if missing_data.sum() > 0:
+        st.warning(f"⚠️ Missing Values Detected: {missing_data.sum()} total")
+        missing_df = pd.DataFrame({
+            'Column': missing_data[missing_data > 0].index,
+            'Missing Count': missing_data[missing_data > 0].values,
+            'Percentage': (missing_data[missing_data > 0].values / max(n_rows, 1) * 100).round(2)
+        })
+        st.dataframe(missing_df, use_container_width=True)
+    else:
+        st.success("✅ No missing values found!")
+
+
+def render_stream_profile(name, preview, profiler, progress):
+    """Render metrics, preview and column analysis for a partially streamed CSV"""
+    done = progress >= 1.0
+    if done:
+        st.success(f"✅ Profiled **{name}** in {profiler.chunks} chunks")
+    else:
+        st.progress(progress, text=f"🌊 Streaming {name}... {profiler.rows:,} rows profiled")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📊 Total Rows" if done else "📊 Rows So Far", f"{profiler.rows:,}")
+    with col2:
+        st.metric("📋 Total Columns", len(profiler.columns))
+    with col3:
+        st.metric("💾 Memory Usage (est.)", f"{profiler.memory_bytes / 1024:.2f} KB")
+    
+    st.markdown("---")
+    
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.markdown("### 🔍 Data Preview (First 10 Rows)")
+    st.dataframe(preview, use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    render_column_analysis(profiler.numeric_ranges(), profiler.categorical_uniques(), approximate=True)
+    render_missing_summary(profiler.null_counts, profiler.rows)
+
+
+def streaming_ingestion_view(uploaded_file, fingerprint, sheet_name=None):
+    """Chunked CSV/Excel ingestion: profile incrementally, materialize the full frame on demand"""
+    # Drop any previously loaded dataset - it no longer matches the upload
+    st.session_state.df = None
+    st.session_state.cleaned_df = None
+    st.session_state.dataset_fingerprint = None
+    st.session_state.cleaned_fingerprint = None
+    
+    st.info("🌊 Streaming mode: statistics below are computed chunk by chunk. "
+            "Load the full dataset to unlock EDA, cleaning and model training.")
+    if st.button("📥 LOAD FULL DATASET", use_container_width=True):
+        with st.spinner("🔄 Loading full dataset..."):
+            df, _, fingerprint = load_uploaded_file(uploaded_file, sheet_name)
+            st.session_state.df = df
+            st.session_state.cleaned_df = df.copy(deep=False)
+            st.session_state.dataset_fingerprint = fingerprint
+            st.session_state.cleaned_fingerprint = fingerprint
+        st.rerun()
+    
+    stream_state = st.session_state.get('stream_profile')
+    if stream_state is not None and stream_state['fingerprint'] == fingerprint:
+        render_stream_profile(uploaded_file.name, stream_state['preview'], stream_state['profiler'], 1.0)
+        return
+    
+    placeholder = st.empty()
+    
+    def on_chunk(preview, profiler, progress):
+        with placeholder.container():
+            render_stream_profile(uploaded_file.name, preview, profiler, min(progress, 0.99))
+    
+    if uploaded_file.name.endswith('.csv'):
+        preview, profiler, format_info = profile_csv_stream(uploaded_file.getvalue(), on_chunk)
+    else:
+        preview, profiler = profile_chunks(stream_excel_chunks(uploaded_file.getvalue(), sheet_name), on_chunk)
+        format_info = None
+    st.session_state.stream_profile = {
+        'fingerprint': fingerprint,
+        'preview': preview,
+        'profiler': profiler,
+        'format_info': format_info,
+    }
+    with placeholder.container():
+        render_stream_profile(uploaded_file.name, preview, profiler, 1.0)
+
+
+def data_ingestion_page():
+    """Data upload and preview section"""
+    st.markdown('<h1 class="glow-text">📂 Data Ingestion Portal</h1>', unsafe_allow_html=True)
+    st.markdown("---")
+    
+    # File uploader
+    uploaded_file = st.file_uploader(
+        "🚀 Upload your dataset (CSV or Excel)",
+        type=['csv', 'xlsx'],
+        help="Drag and drop or click to upload"
+    )
+    
+    if uploaded_file is not None:
+        try:
+            fingerprint = upload_fingerprint(uploaded_file)
+            
+            # Workbooks: pick a sheet from the index without parsing any of them
+            sheet_name = None
+            if not uploaded_file.name.endswith('.csv'):
+                sheets = list_excel_sheets(fingerprint, uploaded_file.getvalue())
+                if len(sheets) > 1:
+                    sheet_name = st.selectbox("📑 Sheet", sheets, help="Only the selected sheet is parsed")
+            
+            # Large files default to chunked profiling; the full frame loads on demand
+            if st.session_state.dataset_fingerprint != dataset_key(fingerprint, sheet_name):
+                streaming = st.toggle(
+                    "🌊 Streaming mode (chunked preview without loading the full file)",
+                    value=uploaded_file.size > STREAMING_THRESHOLD_MB * 1024 ** 2,
+                    help="Profile the file chunk by chunk and load the full dataset only when needed"
+                )
+                if streaming:
+                    streaming_ingestion_view(uploaded_file, dataset_key(fingerprint, sheet_name), sheet_name)
+                    return
+            
+            df, meta, fingerprint = load_uploaded_file(uploaded_file, sheet_name)
+            format_info = meta['format_info']
+            
+            if format_info is not None:
+                format_note = (
+                    f"**{format_info['encoding']}** encoding "
+                    f"({format_info['confidence'] * 100:.0f}% confidence) · "
+                    f"delimiter `{format_info['delimiter']!r}`"
+                )
+                if format_info['encoding'] not in ('utf-8', 'utf-8-sig'):
+                    st.info(f"📝 File loaded successfully with {format_note}")
+                else:
+                    st.caption(f"📝 Detected {format_note}")
+            
+            st.session_state.df = df
+            st.session_state.cleaned_df = df.copy(deep=False)
+            st.session_state.dataset_fingerprint = fingerprint
+            st.session_state.cleaned_fingerprint = fingerprint
+            
+            # Success message
+            st.success(f"✅ Successfully loaded: **{uploaded_file.name}**")
+            cache_stats = get_dataset_cache().stats()
+            st.caption(
+                f"🗄️ Dataset cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · "
+                f"{cache_stats['entries']} entries · {cache_stats['used_mb']:.1f} / {cache_stats['budget_mb']:.0f} MB"
+            )
+            
+            # Dataset shape metrics
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("📊 Total Rows", f"{df.shape[0]:,}")
+            with col2:
+                st.metric("📋 Total Columns", df.shape[1])
+            with col3:
+                render_memory_metric(meta['memory_report'])
+            
+            st.markdown("---")
+            
+            # Data Preview
+            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+            st.markdown("### 🔍 Data Preview (First 10 Rows)")
+            st.dataframe(df.head(10), use_container_width=True)
+            st.markdown('</div>', unsafe_allow_html=True)
+            
+            profile = get_dataset_profile(df, fingerprint)
+            describe = profile['describe']
+            render_column_analysis(
+                {col: (describe.at['min', col], describe.at['max', col]) for col in profile['numeric_cols']},
+                profile['nunique'].to_dict()
+            )
+            render_missing_summary(profile['nulls'], profile['n_rows'])
+                
+        except Exception as e:
+            st.error(f"❌ Error loading file: {str(e)}")
+    else:
+        # Welcome screen
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        st.markdown("""
+        ## 👋 Welcome to the AutoML Dashboard
+        
+        **Getting Started:**
+        1. 📤 Upload your CSV or Excel file using the uploader above
+        2. 📊 Explore your data with Advanced EDA
+        3. 🧹 Clean your data with one-click automation
+        4. 🧠 Train ML models without writing code
+        5. 🔮 Make predictions on new data
+        
+        **Supported File Types:**
+        - `.csv` (Comma-Separated Values)
+        - `.xlsx` (Microsoft Excel)
+        """)
+        st.markdown('</div>', unsafe_allow_html=True)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📊 ADVANCED EDA MODULE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def advanced_eda_page():
+    """Exploratory Data Analysis with interactive visualizations"""
+    st.markdown('<h1 class="glow-text">📊 Advanced Exploratory Data Analysis</h1>', unsafe_allow_html=True)
+    st.markdown("---")
+    
+    if st.session_state.df is None:
+        st.warning("⚠️ Please upload a dataset first in the Data Ingestion section!")
+        return
+    
+    df, fingerprint = active_dataset()
+    profile = get_dataset_profile(df, fingerprint)
+    
+    # Statistical Summary
+    st.markdown("### 📈 Statistical Summary")
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.dataframe(profile['describe'], use_container_width=True)
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    st.markdown("---")
+    
+    # Dynamic Plotting Control Panel
+    st.markdown("### 🎨 Interactive Visualization Studio")
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        chart_type = st.selectbox(
+            "📊 Chart Type",
+            ["Scatter", "Line", "Bar", "3D Scatter", "Box", "Violin", "Histogram", "Density Heatmap", "Pie Chart", "Sunburst", "Treemap", "Funnel", "Area", "Bubble"],
+            help="Select visualization type"
+        )
+    
+    with col2:
+        x_axis = st.selectbox("🔵 X-Axis", df.columns.tolist())
+    
+    with col3:
+        y_axis = st.selectbox("🟢 Y-Axis", df.columns.tolist())
+    
+    with col4:
+        color_col = st.selectbox("🎨 Color (Hue)", [None] + df.columns.tolist())
+    
+    # Aggregating charts share one cached group-by per (axes, aggregation)
+    agg_func = 'sum'
+    path_levels = []
+    if chart_type in AGGREGATED_CHARTS:
+        col1, col2 = st.columns(2)
+        with col1:
+            agg_func = st.selectbox("Σ Aggregation", AGGREGATIONS, help="How Y values are combined per group")
+        if chart_type in ("Sunburst", "Treemap"):
+            with col2:
+                path_levels = st.multiselect(
+                    "🌳 Hierarchy Levels",
+                    [col for col in profile['categorical_cols'] if col not in (x_axis, y_axis)],
+                    help="Extra categorical levels nested under the X-axis"
+                )
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Aggregating charts use all rows; point charts are sampled to a render budget
+    df_viz = df
+    render_note = None
+    
+    # Generate Plot
+    fig = None
+    try:
+        if chart_type == "Scatter":
+            dense = len(df) > RENDER_BUDGET_POINTS * DENSITY_FALLBACK_FACTOR
+            if dense and color_col is None and is_numeric_column(df[x_axis]) and is_numeric_column(df[y_axis]):
+                fig = density_heatmap_figure(df, x_axis, y_axis)
+                st.caption(f"🎯 {len(df):,} points binned into a {DENSITY_BINS}×{DENSITY_BINS} density grid")
+            else:
+                df_viz = render_subset(df, fingerprint, 'scatter', x_axis, y_axis, color_col)
+                render_note = "density-preserving sample"
+                fig = px.scatter(
+                    df_viz, x=x_axis, y=y_axis, color=color_col,
+                    template="plotly_dark",
+                    color_continuous_scale="Viridis"
+                )
+        
+        elif chart_type == "Line":
+            df_viz = render_subset(df, fingerprint, 'line', x_axis, y_axis, color_col, LINE_BUDGET_POINTS)
+            render_note = "LTTB downsampled"
+            fig = px.line(
+                df_viz, x=x_axis, y=y_axis, color=color_col,
+                template="plotly_dark"
+            )
+        
+        elif chart_type == "Bar":
+            # Check if we need aggregation
+            if df_viz[x_axis].dtype in CATEGORICAL_DTYPES and is_numeric_column(df_viz[y_axis]):
+                # Aggregate for categorical x-axis, keeping a categorical hue as a second key
+                bar_color = color_col if color_col not in (None, x_axis, y_axis) and df[color_col].dtype in CATEGORICAL_DTYPES else None
+                bar_keys = [x_axis] + ([bar_color] if bar_color else [])
+                bar_data = get_aggregate(df, fingerprint, bar_keys, y_axis, agg_func)
+                fig = px.bar(bar_data, x=x_axis, y=y_axis, color=bar_color, template="plotly_dark")
+            else:
+                fig = px.bar(df_viz, x=x_axis, y=y_axis, color=color_col, template="plotly_dark")
+        
+        elif chart_type == "3D Scatter":
+            if len(df.columns) >= 3:
+                z_axis = st.selectbox("🔴 Z-Axis", df.columns.tolist())
+                df_viz = render_subset(df, fingerprint, 'scatter', x_axis, y_axis, color_col)
+                render_note = "density-preserving sample"
+                fig = px.scatter_3d(
+                    df_viz, x=x_axis, y=y_axis, z=z_axis, color=color_col,
+                    template="plotly_dark"
+                )
+            else:
+                st.error("❌ Need at least 3 columns for 3D plot")
+                return
+        
+        elif chart_type == "Box":
+            fig = px.box(
+                df_viz, x=x_axis, y=y_axis, color=color_col,
+                template="plotly_dark"
+            )
+        
+        elif chart_type == "Violin":
+            fig = px.violin(df_viz, x=x_axis, y=y_axis, color=color_col, template="plotly_dark")
+        
+        elif chart_type == "Histogram":
+            # Histogram only needs x-axis
+            fig = px.histogram(df_viz, x=x_axis, color=color_col, template="plotly_dark", marginal="box")
+        
+        elif chart_type == "Density Heatmap":
+            # Both axes must be numeric
+            if not is_numeric_column(df_viz[x_axis]) or not is_numeric_column(df_viz[y_axis]):
+                st.error("❌ Density Heatmap requires both X and Y axes to be numeric")
+                return
+            fig = density_heatmap_figure(df_viz, x_axis, y_axis)
+        
+        elif chart_type == "Pie Chart":
+            # Validate: x_axis = category, y_axis = numeric
+            if not is_numeric_column(df_viz[y_axis]):
+                st.error(f"❌ Pie chart Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
+                return
+            # Aggregate and limit to top 20 categories
+            pie_data = get_aggregate(df, fingerprint, [x_axis], y_axis, agg_func).nlargest(20, y_axis)
+            fig = px.pie(pie_data, names=x_axis, values=y_axis, template="plotly_dark", 
+                        color_discrete_sequence=px.colors.sequential.Purp,
+                        title=f"Top 20 {x_axis} by {y_axis}")
+        
+        elif chart_type == "Sunburst":
+            if not is_numeric_column(df_viz[y_axis]):
+                st.error(f"❌ Sunburst Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
+                return
+            # Aggregate and limit
+            sun_data = get_aggregate(df, fingerprint, [x_axis] + path_levels, y_axis, agg_func).nlargest(30, y_axis)
+            fig = px.sunburst(sun_data, path=[x_axis] + path_levels, values=y_axis, template="plotly_dark",
+                            color_discrete_sequence=px.colors.sequential.Purp)
+        
+        elif chart_type == "Treemap":
+            if not is_numeric_column(df_viz[y_axis]):
+                st.error(f"❌ Treemap Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
+                return
+            # Aggregate and limit
+            tree_data = get_aggregate(df, fingerprint, [x_axis] + path_levels, y_axis, agg_func).nlargest(30, y_axis)
+            fig = px.treemap(tree_data, path=[x_axis] + path_levels, values=y_axis, template="plotly_dark",
+                           color_discrete_sequence=px.colors.sequential.Purp)
+        
+        elif chart_type == "Funnel":
+            if not is_numeric_column(df_viz[y_axis]):
+                st.error(f"❌ Funnel Y-axis must be numeric. '{y_axis}' is {df_viz[y_axis].dtype}")
+                return
+            # Aggregate
+            funnel_data = get_aggregate(df, fingerprint, [x_axis], y_axis, agg_func).sort_values(y_axis, ascending=False)
+            fig = px.funnel(funnel_data, x=y_axis, y=x_axis, template="plotly_dark")
+        
+        elif chart_type == "Area":
+            df_viz = render_subset(df, fingerprint, 'line', x_axis, y_axis, color_col, LINE_BUDGET_POINTS)
+            render_note = "LTTB downsampled"
+            fig = px.area(df_viz, x=x_axis, y=y_axis, color=color_col, template="plotly_dark")
+        
+        elif chart_type == "Bubble":
+            numeric_cols = profile['numeric_cols']
+            if len(numeric_cols) < 2:
+                st.error("❌ Bubble chart requires at least 2 numeric columns")
+                return
+            size_col = st.selectbox("🔵 Bubble Size", numeric_cols)
+            df_viz = render_subset(df, fingerprint, 'scatter', x_axis, y_axis, color_col)
+            render_note = "density-preserving sample"
+            fig = px.scatter(df_viz, x=x_axis, y=y_axis, size=size_col, color=color_col, 
+                           template="plotly_dark", size_max=60)
+        
+        # Update layout with cyberpunk theme
+        if fig:
+            fig.update_layout(
+                plot_bgcolor='#0E1117',
+                paper_bgcolor='#0E1117',
+                font=dict(color='#FAFAFA'),
+                title=dict(
+                    text=f"{chart_type}: {y_axis} vs {x_axis}" if chart_type != "Histogram" else f"{chart_type}: {x_axis}",
+                    font=dict(size=20, color='#8B5CF6')
+                )
+            )
+            if render_note is not None:
+                add_render_note(fig, len(df_viz), len(df), render_note)
+            
+            st.plotly_chart(fig, use_container_width=True)
+        
+    except Exception as e:
+        st.error(f"❌ Error creating plot: {str(e)}")
+        st.info("💡 Tip: Make sure you select appropriate column types for this chart")
+    
+    # Correlation Matrix
+    st.markdown("---")
+    st.markdown("### 🔥 Correlation Heatmap")
+    
+    numeric_cols = profile['numeric_cols']
+    if len(numeric_cols) > 1:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            corr_method = st.selectbox("📐 Method", CORR_METHODS, format_func=str.title,
+                                       help="Kendall always runs on a row sample")
+        with col2:
+            corr_view = st.radio(
+                "🔭 View", ["Full Matrix", "Top-K Strongest Pairs"], horizontal=True,
+                index=0 if len(numeric_cols) <= CORR_FULL_MATRIX_MAX else 1
+            )
+        with col3:
+            sample_rows = st.checkbox(
+                f"🎲 Sample {CORR_SAMPLE_ROWS:,} rows", value=len(df) > CORR_SAMPLE_ROWS,
+                disabled=len(df) <= CORR_SAMPLE_ROWS, help="Estimate correlations on a random row sample"
+            )
+        
+        with st.spinner("🔄 Computing correlations..."):
+            corr_matrix = get_correlation(df, fingerprint, corr_method, CORR_SAMPLE_ROWS if sample_rows else None)
+        
+        if corr_view == "Full Matrix":
+            fig = correlation_heatmap(corr_matrix, f"Feature Correlation Matrix ({corr_method.title()})")
+            st.plotly_chart(fig, use_container_width=True)
+        else:
+            top_k = st.slider("🏆 Number of pairs", min_value=5, max_value=100, value=20, step=5)
+            pairs = top_correlated_pairs(corr_matrix, top_k)
+            st.dataframe(pairs, use_container_width=True)
+            
+            # Clustered heatmap over just the features taking part in the top pairs
+            features = list(dict.fromkeys(pairs['Feature A'].tolist() + pairs['Feature B'].tolist()))
+            if len(features) > 1:
+                sub_matrix = corr_matrix.loc[features, features]
+                order = cluster_order(sub_matrix)
+                fig = correlation_heatmap(sub_matrix.loc[order, order],
+                                          f"Top {top_k} Pairs - Clustered ({corr_method.title()})")
+                st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("ℹ️ Need at least 2 numeric columns for correlation analysis")
+    
+    # Distribution Analysis
+    st.markdown("---")
+    st.markdown("### 📊 Distribution Analysis")
+    
+    selected_col = st.selectbox("Select column for distribution", numeric_cols)
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        # Histogram
+        fig = px.histogram(
+            df, x=selected_col,
+            template="plotly_dark",
+            color_discrete_sequence=['#8B5CF6']
+        )
+        fig.update_layout(
+            title=f"Distribution of {selected_col}",
+            plot_bgcolor='#0E1117',
+            paper_bgcolor='#0E1117',
+            font=dict(color='#FAFAFA')
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    with col2:
+        # Box plot
+        fig = px.box(
+            df, y=selected_col,
+            template="plotly_dark",
+            color_discrete_sequence=['#00C9FF']
+        )
+        fig.update_layout(
+            title=f"Box Plot of {selected_col}",
+            plot_bgcolor='#0E1117',
+            paper_bgcolor='#0E1117',
+            font=dict(color='#FAFAFA')
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🧬 DUPLICATE DETECTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+NEAR_DUP_PERMUTATIONS = 32
+NEAR_DUP_BANDS = 8
+NEAR_DUP_THRESHOLD = 0.8
+NEAR_DUP_PREVIEW_ROWS = 20
+
+
+def row_hashes(df, subset=None):
+    """64-bit hash per row over ``subset`` (all columns when empty)"""
+    frame = df[list(subset)] if subset else df
+    return pd.util.hash_pandas_object(frame, index=False).to_numpy()
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_row_hashes(fingerprint, subset, _df):
+    return row_hashes(_df, subset)
+
+
+def get_row_hashes(df, fingerprint, subset=None):
+    """Row hashes cached per dataset version and column subset"""
+    subset = tuple(subset) if subset else None
+    if fingerprint is None:
+        return row_hashes(df, subset)
+    return _cached_row_hashes(fingerprint, subset, df)
+
+
+def duplicate_mask(hashes):
+    """True for every row whose hash already appeared earlier (keep-first semantics)"""
+    return pd.Series(hashes, copy=False).duplicated(keep='first').to_numpy()
+
+
+def _row_texts(df, columns):
+    """Lower-cased, whitespace-normalized text of ``columns`` joined per row"""
+    text = df[columns[0]].astype('string').fillna('')
+    for col in columns[1:]:
+        text = text + ' ' + df[col].astype('string').fillna('')
+    text = text.str.lower().str.replace(r'\s+', ' ', regex=True).str.strip()
+    # Padding guarantees every row at least one 3-byte shingle
+    return ('^^' + text + '$').tolist()
+
+
+def minhash_signatures(texts, num_perm=NEAR_DUP_PERMUTATIONS, seed=0):
+    """MinHash signatures over character 3-gram shingles, one row per text.
+    
+    All texts are packed into one byte buffer so each permutation is a single
+    vectorized multiply-shift hash plus a ``minimum.reduceat`` over row offsets.
+    """
+    signatures = np.empty((len(texts), num_perm), dtype=np.uint32)
+    if not texts:
+        return signatures
+    encoded = [text.encode('utf-8') for text in texts]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    buffer = np.frombuffer(b''.join(encoded), dtype=np.uint8).astype(np.uint64)
+    shingles = (buffer[:-2] << np.uint64(16)) | (buffer[1:-1] << np.uint64(8)) | buffer[2:]
+    # Drop the shingles that straddle two rows; each row keeps length - 2 of them
+    row_ends = np.repeat(np.cumsum(lengths) - 2, lengths)[:len(shingles)]
+    shingles = shingles[np.arange(len(shingles)) < row_ends]
+    starts = np.zeros(len(lengths), dtype=np.int64)
+    np.cumsum(lengths[:-1] - 2, out=starts[1:])
+    
+    rng = np.random.default_rng(seed)
+    multipliers = rng.integers(1, 2 ** 63, num_perm, dtype=np.uint64) | np.uint64(1)
+    offsets = rng.integers(0, 2 ** 63, num_perm, dtype=np.uint64)
+    hashed = np.empty_like(shingles)
+    for j in range(num_perm):
+        np.multiply(shingles, multipliers[j], out=hashed)
+        hashed += offsets[j]
+        hashed >>= np.uint64(32)
+        signatures[:, j] = np.minimum.reduceat(hashed, starts)
+    return signatures
+
+
+def near_duplicate_matches(signatures, threshold=NEAR_DUP_THRESHOLD, bands=NEAR_DUP_BANDS):
+    """LSH banding over MinHash signatures.
+    
+    Returns (match, similarity): for each row the earlier row it near-duplicates
+    (-1 if none) and their estimated Jaccard similarity. Rows are only compared
+    with the first row of each shared band bucket, so the work stays linear and
+    the earliest row of every cluster is never marked.
+    """
+    n, num_perm = signatures.shape
+    rows_per_band = num_perm // bands
+    match = np.full(n, -1, dtype=np.int64)
+    similarity = np.zeros(n)
+    positions = np.arange(n)
+    for band in range(bands):
+        block = signatures[:, band * rows_per_band:(band + 1) * rows_per_band].astype(np.uint64)
+        # Fold the band into one key; a collision only adds a candidate that the check below rejects
+        keys = block[:, 0]
+        for col in range(1, rows_per_band):
+            keys = keys * np.uint64(0x9E3779B97F4A7C15) + block[:, col]
+        codes, _ = pd.factorize(keys)
+        representative = positions[~pd.Series(keys).duplicated().to_numpy()][codes]
+        candidates = positions[(representative != positions) & (match < 0)]
+        if len(candidates) == 0:
+            continue
+        estimate = (signatures[candidates] == signatures[representative[candidates]]).mean(axis=1)
+        hit = estimate >= threshold
+        match[candidates[hit]] = representative[candidates[hit]]
+        similarity[candidates[hit]] = estimate[hit]
+    return match, similarity
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _cached_signatures(fingerprint, columns, _df):
+    return minhash_signatures(_row_texts(_df, list(columns)))
+
+
+def find_near_duplicates(df, fingerprint, columns, threshold=NEAR_DUP_THRESHOLD):
+    """Near-duplicate (match, similarity) on text ``columns``; signatures are cached per dataset"""
+    if fingerprint is None:
+        signatures = minhash_signatures(_row_texts(df, list(columns)))
+    else:
+        signatures = _cached_signatures(fingerprint, tuple(columns), df)
+    return near_duplicate_matches(signatures, threshold)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📏 OUTLIER DETECTION
+# ═══════════════════════════════════════════════════════════════════════════
+
+OUTLIER_METHODS = {
+    'iqr': "📦 IQR Fences",
+    'zscore': "📐 Robust Z-Score",
+    'iforest': "🌲 Isolation Forest",
+}
+OUTLIER_ACTIONS = {
+    'clip': "✂️ Clip to bounds",
+    'drop': "🗑️ Drop rows",
+    'flag': "🚩 Flag rows",
+}
+# IQR multiplier, robust z-score cutoff, or forest contamination
+OUTLIER_FACTORS = {
+    'iqr': (1.0, 5.0, 1.5, 0.5),
+    'zscore': (2.0, 6.0, 3.5, 0.5),
+    'iforest': (0.01, 0.25, 0.05, 0.01),
+}
+OUTLIER_SAMPLE_ROWS = 200_000
+ISOLATION_SAMPLE_ROWS = 20_000
+OUTLIER_FLAG_COLUMN = 'is_outlier'
+MAD_SCALE = 1.4826
+
+
+def _sample_rows(values, sample_rows, seed=42):
+    if len(values) <= sample_rows:
+        return values
+    positions = np.sort(np.random.default_rng(seed).choice(len(values), sample_rows, replace=False))
+    return values[positions]
+
+
+def compute_outlier_stats(df, sample_rows=OUTLIER_SAMPLE_ROWS):
+    """Quartiles, median and MAD of every numeric column in one vectorized pass.
+    
+    Frames longer than ``sample_rows`` use quantiles of a uniform row sample,
+    which keeps the page interactive at the cost of slightly approximate bounds.
+    """
+    numeric = df.select_dtypes(include=[np.number])
+    if numeric.shape[1] == 0 or len(numeric) == 0:
+        return pd.DataFrame(columns=['q1', 'median', 'q3', 'mad'], dtype=np.float64)
+    values = _sample_rows(numeric.to_numpy(dtype=np.float64, na_value=np.nan), sample_rows)
+    q1, median, q3 = np.nanquantile(values, [0.25, 0.5, 0.75], axis=0)
+    mad = np.nanmedian(np.abs(values - median), axis=0)
+    return pd.DataFrame({'q1': q1, 'median': median, 'q3': q3, 'mad': mad}, index=numeric.columns)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_outlier_stats(fingerprint, _df):
+    return compute_outlier_stats(_df)
+
+
+def get_outlier_stats(df, fingerprint):
+    """Outlier statistics cached per dataset version"""
+    if fingerprint is None:
+        return compute_outlier_stats(df)
+    return _cached_outlier_stats(fingerprint, df)
+
+
+def outlier_bounds(df, stats, method, factor):
+    """Lower/upper bounds per column; columns with no spread are left untouched"""
+    if method == 'iqr':
+        spread = stats['q3'] - stats['q1']
+        lower, upper = stats['q1'] - factor * spread, stats['q3'] + factor * spread
+    else:
+        spread = MAD_SCALE * stats['mad']
+        lower, upper = stats['median'] - factor * spread, stats['median'] + factor * spread
+    bounds = pd.DataFrame({'lower': lower, 'upper': upper})[spread > 0]
+    # Integral bounds keep integer columns from being upcast when clipped
+    integer_cols = [col for col in bounds.index if pd.api.types.is_integer_dtype(df[col].dtype)]
+    bounds.loc[integer_cols, 'lower'] = np.ceil(bounds.loc[integer_cols, 'lower'])
+    bounds.loc[integer_cols, 'upper'] = np.floor(bounds.loc[integer_cols, 'upper'])
+    return bounds
+
+
+def outside_bounds(df, bounds):
+    """Boolean frame marking values outside their column's bounds"""
+    values = df[bounds.index.tolist()]
+    return values.lt(bounds['lower'], axis=1) | values.gt(bounds['upper'], axis=1)
+
+
+def isolation_forest_flags(df, contamination, sample_rows=ISOLATION_SAMPLE_ROWS):
+    """Rows an IsolationForest fitted on a row sample scores as anomalous"""
+    numeric = df.select_dtypes(include=[np.number])
+    if numeric.shape[1] == 0 or len(numeric) == 0:
+        return np.zeros(len(df), dtype=bool)
+    values = numeric.to_numpy(dtype=np.float64, na_value=np.nan)
+    sample = _sample_rows(values, sample_rows)
+    medians = np.nan_to_num(np.nanmedian(sample, axis=0))
+    missing = np.isnan(values)
+    if missing.any():
+        values = np.where(missing, medians, values)
+        sample = _sample_rows(values, sample_rows)
+    forest = IsolationForest(contamination=contamination, random_state=42, n_jobs=-1)
+    forest.fit(sample)
+    return forest.predict(values) == -1
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_outlier_preview(fingerprint, method, factor, _df):
+    return compute_outlier_preview(_df, fingerprint, method, factor)
+
+
+def compute_outlier_preview(df, fingerprint, method, factor):
+    """Outlier row mask plus, for bound-based methods, per-column bounds and counts"""
+    if method == 'iforest':
+        return {'rows': isolation_forest_flags(df, factor), 'bounds': None}
+    bounds = outlier_bounds(df, get_outlier_stats(df, fingerprint), method, factor)
+    outside = outside_bounds(df, bounds)
+    bounds['outliers'] = outside.sum()
+    return {'rows': outside.any(axis=1).to_numpy(), 'bounds': bounds}
+
+
+def get_outlier_preview(df, fingerprint, method, factor):
+    """Outlier preview cached per dataset and method, so switching treatments is free"""
+    if fingerprint is None:
+        return compute_outlier_preview(df, None, method, factor)
+    return _cached_outlier_preview(fingerprint, method, factor, df)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🧪 CLEANING PIPELINE
+# ═══════════════════════════════════════════════════════════════════════════
+
+CLEANING_PLAN_VERSION = 1
+CLEANING_CACHE_MB = int(os.environ.get("NOVACORE_CLEANING_CACHE_MB", "1024"))
+
+
+@st.cache_resource
+def get_cleaning_cache():
+    """Step outputs of cleaning plans, kept apart so they never evict parsed uploads"""
+    return DatasetCache(CLEANING_CACHE_MB * 1024 ** 2)
+
+
+def _to_builtin(value):
+    """Convert NumPy scalars to plain Python values for JSON plans"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _fit_impute(df, params):
+    """Fill values for every column: one vectorized median/mean pass plus per-column modes"""
+    numeric = df.select_dtypes(include=[np.number])
+    centers = numeric.median() if params['numeric'] == 'median' else numeric.mean()
+    fills = [[col, _to_builtin(value)] for col, value in centers.dropna().items()]
+    for col in df.select_dtypes(include=CATEGORICAL_DTYPES).columns:
+        mode_value = df[col].mode()
+        if len(mode_value) > 0:
+            fills.append([col, _to_builtin(mode_value[0])])
+    return {'fill_values': fills}
+
+
+def _apply_impute(df, params, state):
+    fills = {col: value for col, value in state['fill_values'] if col in df.columns}
+    if not fills:
+        return df, {'filled_cells': 0}
+    missing = df[list(fills)].isna().sum()
+    fills = {col: fills[col] for col in missing[missing > 0].index}
+    if not fills:
+        return df, {'filled_cells': 0}
+    cleaned_df = df.copy(deep=False)
+    for col, value in fills.items():
+        # Replayed batches may not carry the fitted mode among their categories
+        series = cleaned_df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype) and value not in series.cat.categories:
+            cleaned_df[col] = series.cat.add_categories([value])
+    cleaned_df = cleaned_df.fillna(value=fills)
+    return cleaned_df, {'filled_cells': int(missing.sum())}
+
+
+def _fit_outliers(df, params):
+    """Bounds from the input's statistics; the forest is refitted on whatever it's applied to"""
+    if params['method'] == 'iforest':
+        return {}
+    bounds = outlier_bounds(df, compute_outlier_stats(df), params['method'], params['factor'])
+    return {'bounds': [[col, float(lower), float(upper)] for col, lower, upper in bounds.itertuples()]}
+
+
+def _apply_outliers(df, params, state):
+    bounds = None
+    if params['method'] == 'iforest':
+        rows = isolation_forest_flags(df, params['factor'])
+    else:
+        fitted = [bound for bound in state['bounds'] if bound[0] in df.columns]
+        bounds = pd.DataFrame(fitted, columns=['column', 'lower', 'upper']).set_index('column')
+        rows = outside_bounds(df, bounds).any(axis=1).to_numpy()
+    stats = {'outlier_rows': int(rows.sum())}
+    if params['action'] == 'drop':
+        return (df[~rows] if rows.any() else df), stats
+    cleaned_df = df.copy(deep=False)
+    if params['action'] == 'flag' or bounds is None:
+        cleaned_df[OUTLIER_FLAG_COLUMN] = rows
+    elif rows.any():
+        cols = bounds.index.tolist()
+        cleaned_df[cols] = df[cols].clip(lower=bounds['lower'], upper=bounds['upper'], axis=1)
+    return cleaned_df, stats
+
+
+def _apply_dedup(df, params, state):
+    subset = [col for col in params.get('subset') or [] if col in df.columns]
+    mask = duplicate_mask(row_hashes(df, subset))
+    near = params.get('near')
+    near_columns = [col for col in near['columns'] if col in df.columns] if near else []
+    if near_columns:
+        match, _ = near_duplicate_matches(minhash_signatures(_row_texts(df, near_columns)), near['threshold'])
+        mask = mask | (match >= 0)
+    if not mask.any():
+        return df, {'removed_duplicates': 0}
+    return df[~mask], {'removed_duplicates': int(mask.sum())}
+
+
+def _apply_optimize(df, params, state):
+    cleaned_df, memory_report = optimize_dtypes(df)
+    return cleaned_df, {'memory_report': memory_report}
+
+
+# name -> (fit, apply); stateless steps have no fit and replay as-is on new data
+CLEANING_STEPS = {
+    'impute': (_fit_impute, _apply_impute),
+    'outliers': (_fit_outliers, _apply_outliers),
+    'dedup': (None, _apply_dedup),
+    'optimize': (None, _apply_optimize),
+}
+
+
+class CleaningPlan:
+    """Ordered cleaning steps with their fitted statistics.
+    
+    ``fit_transform`` fits each step on its input and caches every intermediate
+    frame under a key chained from the dataset fingerprint, so changing one
+    option only recomputes that step and the ones after it. ``transform``
+    replays the fitted statistics on new data without refitting.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+
+    @classmethod
+    def from_options(cls, impute=True, numeric_fill='median', outliers=None,
+                     dedup=True, optimize=True, dedup_subset=None, near_duplicates=None):
+        steps = []
+        if impute:
+            steps.append({'name': 'impute', 'params': {'numeric': numeric_fill}})
+        if outliers:
+            steps.append({'name': 'outliers', 'params': outliers})
+        if dedup:
+            params = {}
+            if dedup_subset:
+                params['subset'] = list(dedup_subset)
+            if near_duplicates:
+                params['near'] = near_duplicates
+            steps.append({'name': 'dedup', 'params': params})
+        if optimize:
+            steps.append({'name': 'optimize', 'params': {}})
+        return cls(steps)
+
+    @staticmethod
+    def step_signature(step):
+        return f"clean-{step['name']}-v{CLEANING_PLAN_VERSION}:{json.dumps(step['params'], sort_keys=True)}"
+
+    def output_key(self, fingerprint):
+        """Fingerprint of the fully cleaned frame, or None for unkeyed data"""
+        key = fingerprint
+        for step in self.steps:
+            key = derive_fingerprint(key, self.step_signature(step)) if key else None
+        return key
+
+    def fit_transform(self, df, fingerprint=None):
+        """Fit and apply every step, reusing cached step outputs; returns (df, report)"""
+        cache = get_cleaning_cache()
+        key = fingerprint
+        report = []
+        for step in self.steps:
+            fit, apply = CLEANING_STEPS[step['name']]
+            key = derive_fingerprint(key, self.step_signature(step)) if key else None
+            cached = cache.get(key) if key else None
+            if cached is not None:
+                df, meta = cached
+                step['state'] = meta['state']
+                report.append({'step': step['name'], 'reused': True, **meta['stats']})
+                continue
+            step['state'] = fit(df, step['params']) if fit else {}
+            df, stats = apply(df, step['params'], step['state'])
+            if key:
+                cache.put(key, df, {'state': step['state'], 'stats': stats})
+            report.append({'step': step['name'], 'reused': False, **stats})
+        return df, report
+
+    def transform(self, df):
+        """Replay the fitted plan on new data; returns (df, report)"""
+        report = []
+        for step in self.steps:
+            _, apply = CLEANING_STEPS[step['name']]
+            df, stats = apply(df, step['params'], step.get('state', {}))
+            report.append({'step': step['name'], 'reused': False, **stats})
+        return df, report
+
+    @property
+    def fitted(self):
+        return all('state' in step for step in self.steps)
+
+    def to_dict(self):
+        return {'version': CLEANING_PLAN_VERSION, 'steps': self.steps}
+
+    def to_json(self):
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+    @classmethod
+    def from_dict(cls, payload):
+        """Rebuild a plan, rejecting anything ``transform`` could not replay"""
+        if not isinstance(payload, dict):
+            raise ValueError("A cleaning plan must be a JSON object")
+        if payload.get('version') != CLEANING_PLAN_VERSION:
+            raise ValueError(f"Unsupported cleaning plan version: {payload.get('version')}")
+        steps = payload.get('steps')
+        if not isinstance(steps, list) or not all(isinstance(step, dict) for step in steps):
+            raise ValueError("A cleaning plan needs a list of steps")
+        unknown = [str(step.get('name')) for step in steps if step.get('name') not in CLEANING_STEPS]
+        if unknown:
+            raise ValueError(f"Unknown cleaning steps: {', '.join(unknown)}")
+        malformed = [step['name'] for step in steps
+                     if not isinstance(step.get('params'), dict) or not isinstance(step.get('state', {}), dict)]
+        if malformed:
+            raise ValueError(f"Steps with missing or invalid params/state: {', '.join(malformed)}")
+        return cls(steps)
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+def summarize_cleaning(report):
+    """Collapse a per-step report into the totals shown on the cleaning page"""
+    summary = {'filled_cells': 0, 'outlier_rows': 0, 'removed_duplicates': 0, 'memory_report': None}
+    for entry in report:
+        for field in ('filled_cells', 'outlier_rows', 'removed_duplicates'):
+            summary[field] += entry.get(field, 0)
+        if entry.get('memory_report') is not None:
+            summary['memory_report'] = entry['memory_report']
+    return summary
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🧹 SMART DATA CLEANING MODULE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def smart_data_cleaning_page():
+    """Automated data cleaning with one-click functionality"""
+    st.markdown('<h1 class="glow-text">🧹 Smart Data Cleaning Lab</h1>', unsafe_allow_html=True)
+    st.markdown("---")
+    
+    if st.session_state.df is None:
+        st.warning("⚠️ Please upload a dataset first in the Data Ingestion section!")
+        return
+    
+    df = st.session_state.df
+    profile = get_dataset_profile(df, st.session_state.dataset_fingerprint)
+    
+    # Missing Values Analysis
+    st.markdown("### 🔍 Missing Values Analysis")
+    
+    missing_data = profile['nulls']
+    total_missing = missing_data.sum()
+    
+    if total_missing > 0:
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        
+        missing_df = pd.DataFrame({
+            'Column': missing_data[missing_data > 0].index,
+            'Missing Count': missing_data[missing_data > 0].values,
+            'Percentage': (missing_data[missing_data > 0].values / len(df) * 100).round(2)
+        })
+        
+        st.dataframe(missing_df, use_container_width=True)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
+        # Visualization of missing values
+        fig = px.bar(
+            missing_df,
+            x='Column',
+            y='Percentage',
+            title='Missing Values by Column (%)',
+            template='plotly_dark',
+            color='Percentage',
+            color_continuous_scale='Reds'
+        )
+        fig.update_layout(
+            plot_bgcolor='#0E1117',
+            paper_bgcolor='#0E1117',
+            font=dict(color='#FAFAFA')
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        
+    else:
+        st.success("✅ No missing values detected!")
+    
+    # Duplicate Analysis
+    st.markdown("---")
+    st.markdown("### 🔄 Duplicate Rows Analysis")
+    
+    fingerprint = st.session_state.dataset_fingerprint
+    dedup_subset = st.multiselect("🧷 Compare on columns (all columns when empty)", df.columns.tolist())
+    duplicates = int(duplicate_mask(get_row_hashes(df, fingerprint, dedup_subset)).sum())
+    col1, col2 = st.columns(2)
+    with col1:
+        st.metric("Total Duplicate Rows", duplicates)
+    with col2:
+        st.metric("Percentage", f"{(duplicates / len(df) * 100):.2f}%")
+    
+    near_duplicates = None
+    text_cols = profile['categorical_cols']
+    if text_cols and st.toggle("🧬 Near-duplicate detection (MinHash/LSH)", value=False):
+        col1, col2 = st.columns(2)
+        with col1:
+            near_cols = st.multiselect("Text columns", text_cols, default=text_cols[:3])
+        with col2:
+            threshold = st.slider("Similarity threshold", 0.5, 1.0, NEAR_DUP_THRESHOLD, 0.05)
+        if near_cols:
+            with st.spinner("🔄 Hashing text shingles..."):
+                match, similarity = find_near_duplicates(df, fingerprint, near_cols, threshold)
+            near_rows = np.flatnonzero(match >= 0)
+            st.metric("Near-Duplicate Rows", len(near_rows))
+            if len(near_rows) > 0:
+                preview_rows = near_rows[:NEAR_DUP_PREVIEW_ROWS]
+                pairs = pd.DataFrame({
+                    'Row': df.index[preview_rows],
+                    'Matches Row': df.index[match[preview_rows]],
+                    'Similarity': similarity[preview_rows].round(2),
+                })
+                for col in near_cols:
+                    pairs[col] = df[col].iloc[preview_rows].to_numpy()
+                    pairs[f"{col} (match)"] = df[col].iloc[match[preview_rows]].to_numpy()
+                st.dataframe(pairs, use_container_width=True)
+            near_duplicates = {'columns': list(near_cols), 'threshold': float(threshold)}
+    
+    # Outlier Analysis
+    st.markdown("---")
+    st.markdown("### 📏 Outlier Detection")
+    
+    outliers = None
+    if profile['numeric_cols']:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            outlier_method = st.selectbox("Method", list(OUTLIER_METHODS), format_func=OUTLIER_METHODS.get)
+        with col2:
+            low, high, default, step = OUTLIER_FACTORS[outlier_method]
+            factor_label = "Contamination" if outlier_method == 'iforest' else "Threshold"
+            outlier_factor = st.slider(factor_label, low, high, default, step, key=f"outlier_factor_{outlier_method}")
+        with col3:
+            # Isolation Forest scores whole rows, so there are no bounds to clip to
+            actions = [action for action in OUTLIER_ACTIONS if outlier_method != 'iforest' or action != 'clip']
+            outlier_action = st.radio("Treatment", actions, format_func=OUTLIER_ACTIONS.get, horizontal=True)
+        
+        with st.spinner("🔄 Scoring outliers..."):
+            preview = get_outlier_preview(df, fingerprint, outlier_method, float(outlier_factor))
+        outlier_rows = int(preview['rows'].sum())
+        bounds = preview['bounds']
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("Outlier Rows", outlier_rows)
+        with col2:
+            st.metric("Percentage", f"{(outlier_rows / max(len(df), 1) * 100):.2f}%")
+        with col3:
+            if outlier_action == 'clip':
+                st.metric("Values Clipped", int(bounds['outliers'].sum()))
+            elif outlier_action == 'drop':
+                st.metric("Rows Dropped", outlier_rows)
+            else:
+                st.metric("Rows Flagged", outlier_rows)
+        
+        if bounds is not None and len(bounds) > 0:
+            bounds_df = bounds.reset_index(names='Column').rename(
+                columns={'lower': 'Lower Bound', 'upper': 'Upper Bound', 'outliers': 'Outliers'}
+            )
+            st.dataframe(bounds_df, use_container_width=True)
+        
+        if st.checkbox("📏 Treat outliers in the One-Click Cleaner", value=False):
+            outliers = {'method': outlier_method, 'factor': float(outlier_factor), 'action': outlier_action}
+    else:
+        st.info("ℹ️ No numeric columns to check for outliers.")
+    
+    # One-Click Clean Button
+    st.markdown("---")
+    st.markdown("### 🚀 Automated Cleaning")
+    
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    st.markdown("""
+    **The One-Click Cleaner will:**
+    - 🔢 Fill numeric missing values with **Median**
+    - 🏷️ Fill categorical missing values with **Mode**
+    - 📏 Treat outliers (when enabled above)
+    - 🗑️ Remove duplicate rows (and near-duplicates, when enabled above)
+    - ✨ Optimize data types
+    """)
+    
+    with st.expander("⚙️ Pipeline Options"):
+        col1, col2 = st.columns(2)
+        with col1:
+            impute = st.checkbox("🩹 Impute missing values", value=True)
+            numeric_fill = st.selectbox("Numeric fill", ['median', 'mean'], disabled=not impute)
+            dedup = st.checkbox("🗑️ Remove duplicate rows", value=True)
+        with col2:
+            optimize = st.checkbox("✨ Optimize data types", value=True)
+    plan = CleaningPlan.from_options(impute, numeric_fill, outliers, dedup, optimize,
+                                     dedup_subset, near_duplicates)
+    
+    if st.button("🧹 ONE-CLICK CLEAN", use_container_width=True):
+        with st.spinner("🔄 Cleaning data..."):
+            # Re-cleaning the same upload reloads the stored result; changed options
+            # only recompute the steps from the first changed one onwards
+            cleaned_key = plan.output_key(fingerprint)
+            store = get_dataset_store()
+            stored = store.load(cleaned_key) if cleaned_key else None
+            if stored is not None:
+                reuse_line = "💽 Loaded the stored result of an earlier run with these options"
+                cleaned_df, clean_meta = stored
+                plan = CleaningPlan.from_dict(clean_meta['plan'])
+                report = clean_meta['report']
+            else:
+                cleaned_df, report = plan.fit_transform(df, fingerprint)
+                reuse_line = f"♻️ Reused {sum(entry['reused'] for entry in report)} of {len(report)} cached steps"
+                if cleaned_key:
+                    store.save(cleaned_key, cleaned_df, {'plan': plan.to_dict(), 'report': report})
+            summary = summarize_cleaning(report)
+            memory_report = summary['memory_report']
+            
+            # Update session state
+            st.session_state.cleaned_df = cleaned_df
+            st.session_state.cleaned_fingerprint = cleaned_key
+            st.session_state.cleaning_plan = plan
+            
+            st.success(f"""
+            ✅ **Data Cleaning Complete!**
+            - 🩹 Filled {summary['filled_cells']} missing values
+            - 📏 Treated {summary['outlier_rows']} outlier rows
+            - 🗑️ Removed {summary['removed_duplicates']} duplicate rows
+            - 📊 Final dataset: {len(cleaned_df)} rows × {len(cleaned_df.columns)} columns
+            - {reuse_line}
+            """)
+            
+            # Show before/after comparison
+            col1, col2 = st.columns(2)
+            with col1:
+                st.metric("Original Rows", len(df))
+                st.metric("Original Missing Values", total_missing)
+            with col2:
+                st.metric("Cleaned Rows", len(cleaned_df))
+                st.metric("Remaining Missing Values", get_dataset_profile(cleaned_df, cleaned_key)['nulls'].sum())
+            if memory_report is not None:
+                render_memory_metric(memory_report)
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Export the fitted plan, or replay one fitted on another upload
+    st.markdown("---")
+    st.markdown("### 📜 Cleaning Plan")
+    
+    fitted_plan = st.session_state.cleaning_plan
+    if fitted_plan is not None:
+        st.caption(" → ".join(step['name'] for step in fitted_plan.steps) or "Empty plan")
+        st.download_button(
+            "💾 Download Cleaning Plan",
+            fitted_plan.to_json(),
+            file_name="cleaning_plan.json",
+            mime="application/json",
+            use_container_width=True
+        )
+    
+    plan_file = st.file_uploader("📤 Replay a saved plan on this dataset", type=['json'], key="cleaning_plan_upload")
+    if plan_file is not None and st.button("▶️ REPLAY PLAN", use_container_width=True):
+        try:
+            replay_plan = CleaningPlan.from_json(plan_file.getvalue())
+        except (ValueError, KeyError) as e:
+            st.error(f"❌ Invalid cleaning plan: {str(e)}")
+        else:
+            if not replay_plan.fitted:
+                st.error("❌ This plan has no fitted statistics to replay.")
+            else:
+                try:
+                    with st.spinner("🔄 Replaying plan..."):
+                        cleaned_df, report = replay_plan.transform(df)
+                except Exception as e:
+                    # Fitted on another dataset - e.g. a column it fills or clips is missing here
+                    st.error(f"❌ Could not replay this plan on the current dataset: {str(e)}")
+                else:
+                    plan_digest = hashlib.blake2b(plan_file.getvalue(), digest_size=8).hexdigest()
+                    st.session_state.cleaned_df = cleaned_df
+                    st.session_state.cleaned_fingerprint = (
+                        derive_fingerprint(fingerprint, f"replay:{plan_digest}") if fingerprint else None
+                    )
+                    st.session_state.cleaning_plan = replay_plan
+                    summary = summarize_cleaning(report)
+                    st.success(f"✅ Plan replayed: filled {summary['filled_cells']} values, treated "
+                               f"{summary['outlier_rows']} outlier rows, removed {summary['removed_duplicates']} duplicates.")
+    
+    # Preview cleaned data
+    if st.session_state.cleaned_df is not None:
+        st.markdown("---")
+        st.markdown("### ✨ Cleaned Data Preview")
+        st.dataframe(st.session_state.cleaned_df.head(10), use_container_width=True)
+
+# ═══════════════════════════════════════════════════════════════════════════
+# ⚙️ TRAINING JOBS
+# ═══════════════════════════════════════════════════════════════════════════
+
+REGRESSION_MODELS = ["Random Forest Regressor", "Linear Regression", "Ridge", "Lasso", "Gradient Boosting Regressor",
+                     "Hist Gradient Boosting Regressor", "SVR"]
+CLASSIFICATION_MODELS = ["Random Forest", "Logistic Regression", "Gradient Boosting", "Hist Gradient Boosting"]
+CPU_CORES = os.cpu_count() or 1
+TRAINING_WORKERS = int(os.environ.get("NOVACORE_TRAINING_WORKERS", str(min(4, CPU_CORES))))
+# Default per-job core budget: an even share of the machine across the pool
+DEFAULT_CORE_BUDGET = max(1, CPU_CORES // TRAINING_WORKERS)
+STAGED_FIT_STEPS = 10
+JOB_POLL_SECONDS = 1.0
+JOB_RESULT_TTL_SECONDS = 3600
+
+
+def pool_task(func):
+    """Resolve ``func`` on the importable module so process pools pickle it by reference.
+    
+    Streamlit executes this file as ``__main__``, which worker processes can't import.
+    """
+    module = importlib.import_module(os.path.splitext(os.path.basename(__file__))[0])
+    return getattr(module, func.__name__)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def _cached_target_cardinality(fingerprint, target, _df):
+    return int(_df[target].nunique())
+
+
+def is_regression_target(df, fingerprint, target):
+    """Many distinct values, or a float target with more than five, means regression"""
+    if fingerprint is None:
+        unique_targets = int(df[target].nunique())
+    else:
+        unique_targets = _cached_target_cardinality(fingerprint, target, df)
+    return unique_targets > 10 or (df[target].dtype in ['float64', 'float32'] and unique_targets > 5)
+
+
+def build_model(model_type, is_regression, n_jobs=1):
+    """Fresh, unfitted estimator for a catalog entry; forests build trees on ``n_jobs`` cores"""
+    if is_regression:
+        if model_type == "Random Forest Regressor":
+            return RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=n_jobs)
+        elif model_type == "Linear Regression":
+            return LinearRegression()
+        elif model_type == "Ridge":
+            return Ridge(alpha=1.0, random_state=42)
+        elif model_type == "Lasso":
+            return Lasso(alpha=1.0, random_state=42)
+        elif model_type == "Gradient Boosting Regressor":
+            return GradientBoostingRegressor(n_estimators=100, random_state=42)
+        elif model_type == "Hist Gradient Boosting Regressor":
+            return HistGradientBoostingRegressor(max_iter=100, random_state=42)
+        return SVR(kernel='rbf')
+    if model_type == "Random Forest":
+        return RandomForestClassifier(n_estimators=100, random_state=42, n_jobs=n_jobs)
+    elif model_type == "Logistic Regression":
+        return LogisticRegression(max_iter=1000, random_state=42)
+    elif model_type == "Hist Gradient Boosting":
+        return HistGradientBoostingClassifier(max_iter=100, random_state=42)
+    return GradientBoostingClassifier(n_estimators=100, random_state=42)
+
+
+class CategoricalEncoder:
+    """Integer codes for categorical features, and optionally a categorical target.
+    
+    Fitting stores one vocabulary per column. For a column with ``k`` categories
+    seen in training, codes ``0..k-1`` are those categories, ``k`` is an explicit
+    bucket for missing values and ``k + 1`` is the bucket for categories never
+    seen in training. Batches are encoded by looking up each column's distinct
+    values once, never by converting every cell to ``str``.
+    """
+
+    def __init__(self):
+        self.vocabularies = {}
+        self.classes_ = None
+
+    @staticmethod
+    def _vocabulary(series):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            categories = series.cat.categories
+        else:
+            categories = pd.Index(pd.unique(series.dropna()))
+        try:
+            return categories.sort_values()
+        except TypeError:
+            # Mixed types don't sort; first-seen order is just as stable
+            return categories
+
+    @staticmethod
+    def _codes(series, vocabulary):
+        """Codes of ``series`` in ``vocabulary``, computed with one hash lookup per distinct value"""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+            uniques = pd.Index(uniques)
+        if vocabulary.inferred_type == 'string' and uniques.inferred_type != 'string':
+            # e.g. zip codes that come back as numbers from a CSV: compare them as text
+            uniques = uniques.astype(str)
+        k = len(vocabulary)
+        lookup = vocabulary.get_indexer(uniques)
+        # Position -1 (a missing value) picks the trailing missing bucket
+        lookup = np.append(np.where(lookup < 0, k + 1, lookup), k)
+        return lookup[codes]
+
+    @classmethod
+    def _fit_codes(cls, series):
+        """(vocabulary, codes) from a single factorization of a training column"""
+        if not isinstance(series.dtype, pd.CategoricalDtype):
+            try:
+                codes, vocabulary = pd.factorize(series, sort=True)
+                return pd.Index(vocabulary), np.where(codes < 0, len(vocabulary), codes)
+            except TypeError:
+                pass
+        vocabulary = cls._vocabulary(series)
+        return vocabulary, cls._codes(series, vocabulary)
+
+    def fit(self, X, y=None):
+        self.fit_transform(X, y)
+        return self
+
+    def fit_transform(self, X, y=None):
+        """Fit the vocabularies and return the encoded ``(X, y)`` from the same pass"""
+        # Shallow: under Copy-on-Write numeric columns keep sharing the caller's buffers
+        X = X.copy(deep=False)
+        for col in X.select_dtypes(include=CATEGORICAL_DTYPES).columns:
+            self.vocabularies[col], X[col] = self._fit_codes(X[col])
+        if y is not None and y.dtype in CATEGORICAL_DTYPES:
+            self.classes_, codes = self._fit_codes(y)
+            y = pd.Series(codes, index=y.index, name=y.name)
+        return X, y
+
+    def transform(self, X):
+        """``X`` with every fitted categorical column replaced by its codes"""
+        X = X.copy(deep=False)
+        for col, vocabulary in self.vocabularies.items():
+            if col in X.columns:
+                X[col] = self._codes(X[col], vocabulary)
+        return X
+
+    def encode_target(self, y):
+        if self.classes_ is None:
+            return y
+        return pd.Series(self._codes(y, self.classes_), index=y.index, name=y.name)
+
+    def decode_target(self, codes):
+        """Original target labels of ``codes``; the missing bucket decodes to NaN"""
+        if self.classes_ is None:
+            return np.asarray(codes)
+        return np.append(self.classes_.to_numpy(dtype=object), np.nan)[np.asarray(codes)]
+
+
+def encode_training_data(df, features, target):
+    """Encode categorical features and target with one fitted encoder; returns (X, y, encoder)"""
+    X = df[features]
+    y = df[target]
+    encoder = CategoricalEncoder()
+    X, y = encoder.fit_transform(X, y)
+    return X, y, encoder
+
+
+def job_reporter(job_id, progress, cancelled):
+    """``report(fraction, message)`` for worker jobs; raises once the job has been cancelled"""
+    def report(fraction, message):
+        if job_id in cancelled:
+            raise InterruptedError("Training job cancelled")
+        progress[job_id] = (fraction, message)
+    return report
+
+
+# Per-worker LRU of encoded matrices, so races, tuning and CV runs on the same
+# data skip re-encoding when a worker picks up another of their jobs. Bounded by
+# bytes, since an idle worker keeps whatever it holds until its next job
+_WORKER_MATRICES = OrderedDict()
+WORKER_MATRIX_MB = int(os.environ.get("NOVACORE_WORKER_MATRIX_MB", "512"))
+
+
+def _worker_cached(key, build):
+    if key[1] is None:
+        return build()
+    if key in _WORKER_MATRICES:
+        _WORKER_MATRICES.move_to_end(key)
+        return _WORKER_MATRICES[key][0]
+    value = build()
+    nbytes = sum(int(np.sum(part.memory_usage(deep=True))) for part in value
+                 if isinstance(part, (pd.DataFrame, pd.Series)))
+    budget = WORKER_MATRIX_MB * 1024 ** 2
+    if nbytes <= budget:
+        _WORKER_MATRICES[key] = (value, nbytes)
+        while sum(size for _, size in _WORKER_MATRICES.values()) > budget:
+            _WORKER_MATRICES.popitem(last=False)
+    return value
+
+
+def stored_frame(df, fingerprint):
+    """``df`` itself, or - for jobs sent ``None`` - the dataset memory-mapped from the store"""
+    if df is not None:
+        return df
+    loaded = DatasetStore(DATASET_STORE_DIR, DATASET_STORE_MB * 1024 ** 2).load(fingerprint)
+    if loaded is None:
+        raise RuntimeError(f"Dataset {fingerprint} is no longer in the dataset store")
+    return loaded[0]
+
+
+def training_matrix(fingerprint, df, features, target):
+    """Encoded (X, y, encoder) for the whole dataset, cached per worker by fingerprint"""
+    return _worker_cached(('full', fingerprint, tuple(features), target),
+                          lambda: encode_training_data(stored_frame(df, fingerprint), features, target))
+
+
+def split_positions(n_rows, test_size):
+    """(train, test) row positions of the seeded split every training path uses"""
+    return train_test_split(np.arange(n_rows), test_size=test_size/100, random_state=42)
+
+
+def training_split(fingerprint, df, features, target, test_size):
+    """Encoded (X_train, X_test, y_train, y_test, encoder), cached per worker by fingerprint"""
+    def build():
+        X, y, encoder = encode_training_data(stored_frame(df, fingerprint), features, target)
+        train_index, test_index = split_positions(len(X), test_size)
+        return X.iloc[train_index], X.iloc[test_index], y.iloc[train_index], y.iloc[test_index], encoder
+    return _worker_cached(('split', fingerprint, tuple(features), target, test_size), build)
+
+
+def memmap_for_workers(scratch, *arrays):
+    """Dump arrays once and memory-map them back, so joblib ships tasks a file reference, not the data"""
+    path = os.path.join(scratch, 'arrays.joblib')
+    joblib.dump(arrays, path)
+    return joblib.load(path, mmap_mode='r')
+
+
+def fit_staged(model, X, y, on_stage):
+    """Fit ensembles in warm-start stages so a worker can report progress and stop between them"""
+    total = getattr(model, 'n_estimators', None)
+    if not isinstance(total, int) or 'warm_start' not in model.get_params():
+        on_stage(0.0)
+        return model.fit(X, y)
+    # Each stage adds at least one tree per core so parallel forests stay saturated
+    step = max(1, total // STAGED_FIT_STEPS, model.get_params().get('n_jobs') or 1)
+    model.set_params(warm_start=True)
+    for n_estimators in range(step, total + step, step):
+        model.set_params(n_estimators=min(n_estimators, total))
+        model.fit(X, y)
+        on_stage(min(n_estimators, total) / total)
+    return model.set_params(warm_start=False)
+
+
+def run_training_job(job_id, progress, cancelled, df, features, target, model_type, is_regression, test_size,
+                     n_jobs=1, train_rows=None, include_data=True, fingerprint=None):
+    """Worker entry point: encode, split, fit and score one model on ``n_jobs`` cores.
+    
+    ``train_rows`` fits on a prefix of the (already shuffled) training split.
+    The result carries the split's row positions, not the encoded matrices, so
+    the session rebuilds them from its own frame; ``include_data=False`` leaves
+    even the positions out.
+    """
+    report = job_reporter(job_id, progress, cancelled)
+    
+    report(0.02, "Encoding features")
+    X_train, X_test, y_train, y_test, encoder = training_split(fingerprint, df, features, target, test_size)
+    
+    fit_X, fit_y = (X_train, y_train) if train_rows is None else (X_train.iloc[:train_rows], y_train.iloc[:train_rows])
+    
+    model = build_model(model_type, is_regression, n_jobs)
+    started = time.perf_counter()
+    # Caps the OpenMP/BLAS threads of histogram boosting and linear solvers to the same budget
+    with threadpool_limits(limits=n_jobs):
+        fit_staged(model, fit_X, fit_y,
+                   lambda done: report(0.1 + 0.85 * done, f"Fitting {model_type} ({done:.0%})"))
+        fit_seconds = time.perf_counter() - started
+        report(0.97, "Scoring on the test split")
+        score = model.score(X_test, y_test)
+    
+    result = {
+        'model': model,
+        'feature_names': features,
+        'target_name': target,
+        'encoder': encoder,
+        'is_regression': is_regression,
+        'problem_type': "Regression" if is_regression else "Classification",
+        'model_fingerprint': fingerprint,
+        'score': score,
+        'fit_seconds': fit_seconds,
+        'train_rows': len(fit_X),
+    }
+    if include_data:
+        result.update(zip(SPLIT_KEYS, split_positions(len(X_train) + len(X_test), test_size)))
+    return result
+
+
+class TrainingJobRunner:
+    """Bounded process pool shared by every session, with job status, progress and cancellation.
+    
+    Workers report ``(fraction, message)`` through a manager dict and check a
+    shared cancel set between fitting stages, so a running fit can be stopped
+    without killing its worker.
+    """
+
+    def __init__(self, max_workers):
+        methods = multiprocessing.get_all_start_methods()
+        # The server process is multi-threaded, so never fork it directly
+        context = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        self._manager = context.Manager()
+        self._progress = self._manager.dict()
+        self._cancelled = self._manager.dict()
+        self._executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.max_workers = max_workers
+
+    def submit(self, func, label, *args):
+        """Queue ``func(job_id, progress, cancelled, *args)`` on the pool; returns the job ID"""
+        self.prune()
+        job_id = uuid.uuid4().hex[:12]
+        future = self._executor.submit(pool_task(func), job_id, self._progress, self._cancelled, *args)
+        job = {'future': future, 'label': label, 'submitted': time.time(), 'finished': None,
+               'cancel_requested': False}
+        future.add_done_callback(lambda _: job.update(finished=time.time()))
+        with self._lock:
+            self._jobs[job_id] = job
+        return job_id
+
+    def status(self, job_id):
+        """Snapshot of a job's state, progress and timing, or None for unknown IDs"""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        future = job['future']
+        fraction, message = self._progress.get(job_id, (0.0, "Waiting for a worker"))
+        error = None
+        if future.cancelled():
+            state = 'cancelled'
+        elif future.done():
+            error = future.exception()
+            if error is None:
+                # Finished before a late cancel reached it - the result is still good
+                state = 'done'
+            elif job['cancel_requested'] and isinstance(error, InterruptedError):
+                state, error = 'cancelled', None
+            else:
+                state = 'failed'
+        else:
+            state = 'running' if job_id in self._progress else 'queued'
+        end = job['finished'] or time.time()
+        return {
+            'state': state,
+            'progress': fraction,
+            'message': message,
+            'label': job['label'],
+            'elapsed': end - job['submitted'],
+            'error': error,
+        }
+
+    def cancel(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        job['cancel_requested'] = True
+        self._cancelled[job_id] = True
+        job['future'].cancel()
+
+    def result(self, job_id):
+        """Collect a finished job's result and forget it"""
+        job = self.forget(job_id)
+        return job['future'].result() if job is not None else None
+
+    def forget(self, job_id):
+        with self._lock:
+            job = self._jobs.pop(job_id, None)
+        self._progress.pop(job_id, None)
+        self._cancelled.pop(job_id, None)
+        return job
+
+    def active_count(self):
+        return sum(not job['future'].done() for job in list(self._jobs.values()))
+
+    def prune(self):
+        """Drop results nobody collected (e.g. the browser tab was closed)"""
+        cutoff = time.time() - JOB_RESULT_TTL_SECONDS
+        for job_id, job in list(self._jobs.items()):
+            if job['finished'] is not None and job['finished'] < cutoff:
+                self.forget(job_id)
+
+
+@st.cache_resource
+def get_training_runner():
+    """Process-wide training pool shared by every session"""
+    return TrainingJobRunner(TRAINING_WORKERS)
+
+
+HANDOFF_KEYS = ['model', 'feature_names', 'target_name', 'encoder', 'is_regression', 'problem_type',
+                'cv_results', 'model_fingerprint']
+# Jobs return split row positions; cross-validation results have none and train on every row
+SPLIT_KEYS = ['train_index', 'test_index']
+
+
+def rebuild_split(df, result):
+    """Encoded train/test frames of a finished job, sliced from ``df`` by its split positions"""
+    encoder = result['encoder']
+    X = encoder.transform(df[result['feature_names']])
+    y = encoder.encode_target(df[result['target_name']])
+    if result.get('test_index') is None:
+        return {'X_train': X, 'X_test': None, 'y_train': y, 'y_test': None}
+    train_index, test_index = result['train_index'], result['test_index']
+    return {'X_train': X.iloc[train_index], 'X_test': X.iloc[test_index],
+            'y_train': y.iloc[train_index], 'y_test': y.iloc[test_index]}
+
+
+def apply_training_result(result, df):
+    """Hand a finished job's model over to the session, rebuilding its split from ``df``.
+    
+    Workers never pickle the encoded matrices back: the session re-encodes the
+    frame the job was submitted with, whose numeric columns it already holds.
+    """
+    for key in HANDOFF_KEYS:
+        st.session_state[key] = result.get(key)
+    for key, value in rebuild_split(df, result).items():
+        st.session_state[key] = value
+    # Identifies this trained model in caches keyed by model
+    st.session_state.model_token = uuid.uuid4().hex[:12]
+    st.session_state.training_notice = (
+        f"✅ Model trained successfully! Detected **{result['problem_type']}** problem."
+    )
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def training_job_panel():
+    """Live status of the session's training job; hands the model over when it finishes"""
+    runner = get_training_runner()
+    job_id = st.session_state.training_job
+    status = runner.status(job_id)
+    if status is None:
+        st.session_state.training_job = None
+        st.query_params.pop('job', None)
+        st.rerun()
+    
+    if status['state'] in ('queued', 'running'):
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        st.markdown(f"#### ⏳ Training **{status['label']}** · job `{job_id}`")
+        st.progress(min(status['progress'], 1.0), text=status['message'])
+        st.caption(f"{status['state'].title()} for {status['elapsed']:.1f}s · "
+                   f"{runner.active_count()} active job(s) on {runner.max_workers} shared worker(s)")
+        if st.button("⛔ CANCEL TRAINING", use_container_width=True):
+            runner.cancel(job_id)
+        st.markdown('</div>', unsafe_allow_html=True)
+        return
+    
+    st.session_state.training_job = None
+    st.query_params.pop('job', None)
+    frame = st.session_state.training_job_frame
+    st.session_state.training_job_frame = None
+    if status['state'] == 'done':
+        result = runner.result(job_id)
+        if frame is None:
+            # Picked back up from the URL: only the same dataset can rebuild the split
+            active, active_fingerprint = active_dataset()
+            if active_fingerprint is not None and active_fingerprint == result['model_fingerprint']:
+                frame = active
+        if frame is None:
+            st.session_state.training_notice = "❌ The dataset this model was trained on is no longer loaded."
+        else:
+            apply_training_result(result, frame)
+            st.session_state.tuning_results = result.get('search')
+    elif status['state'] == 'failed':
+        runner.forget(job_id)
+        st.session_state.training_notice = f"❌ Error training model: {str(status['error'])}"
+    else:
+        runner.forget(job_id)
+        st.session_state.training_notice = "⛔ Training cancelled."
+    st.rerun()
+
+
+RACE_HALVING_FACTOR = 3
+RACE_MIN_TRAIN_ROWS = 1_000
+RACE_STATUS_ICONS = {
+    'queued': "⏳ Queued",
+    'running': "🏃 Running",
+    'done': "✅ Done",
+    'stopped': "⏹️ Stopped early",
+    'failed': "❌ Failed",
+    'cancelled': "⛔ Cancelled",
+}
+
+
+def race_schedule(n_train, n_candidates, factor=RACE_HALVING_FACTOR, min_rows=RACE_MIN_TRAIN_ROWS):
+    """Training rows per successive-halving rung, ending with the full training split.
+    
+    Each rung keeps the best 1/``factor`` of its candidates until at most
+    ``factor`` are left; rungs smaller than ``min_rows`` are skipped.
+    """
+    survivors = [n_candidates]
+    while survivors[-1] > factor:
+        survivors.append(-(-survivors[-1] // factor))
+    rows = [n_train // factor ** (len(survivors) - 1 - rung) for rung in range(len(survivors))]
+    return [n for n in rows[:-1] if n >= min_rows] + [n_train]
+
+
+def _submit_race_job(runner, race, name):
+    final = race['rung'] == len(race['schedule']) - 1
+    train_rows = race['schedule'][race['rung']]
+    df, features, target, is_regression, test_size, n_jobs, fingerprint = race['args']
+    job_id = runner.submit(
+        run_training_job, name,
+        None if race['stored'] else df, features, target, name, is_regression, test_size, n_jobs,
+        None if final else train_rows, final, fingerprint
+    )
+    race['candidates'][name].update(job_id=job_id, status='queued', rung=race['rung'], train_rows=train_rows)
+
+
+def start_race(runner, models, df, features, target, is_regression, test_size, n_jobs, fingerprint=None):
+    """Queue the first rung of a successive-halving race over ``models``"""
+    n_train = len(df) - int(np.ceil(len(df) * test_size / 100))
+    race = {
+        'args': (df, features, target, is_regression, test_size, n_jobs, fingerprint),
+        'schedule': race_schedule(n_train, len(models)),
+        'rung': 0,
+        'candidates': {name: {'status': 'queued', 'score': None, 'fit_seconds': None, 'result': None}
+                       for name in models},
+        'data': None,
+        'finished': False,
+        'stopped': False,
+        # A race submits a job per candidate and rung; when the dataset is already in the
+        # store, workers memory-map it instead of each job pickling the whole frame
+        'stored': fingerprint is not None and os.path.exists(get_dataset_store().path_for(fingerprint)),
+        'started': time.time(),
+    }
+    for name in models:
+        _submit_race_job(runner, race, name)
+    return race
+
+
+def advance_race(runner, race):
+    """Collect finished jobs; once a rung completes, stop its losers and queue the next rung"""
+    pending = False
+    for name, candidate in race['candidates'].items():
+        job_id = candidate.get('job_id')
+        if job_id is None:
+            continue
+        status = runner.status(job_id)
+        if status is None:
+            candidate.update(job_id=None, status='cancelled')
+            continue
+        if status['state'] in ('queued', 'running'):
+            candidate['status'] = status['state']
+            pending = True
+            continue
+        candidate['job_id'] = None
+        candidate['status'] = status['state']
+        if status['state'] != 'done':
+            runner.forget(job_id)
+            continue
+        result = runner.result(job_id)
+        candidate.update(score=result['score'], fit_seconds=result['fit_seconds'],
+                         result={key: value for key, value in result.items() if key in HANDOFF_KEYS})
+        # Every final-rung job shares one split; keep the first copy that arrives
+        if race['data'] is None and 'train_index' in result:
+            race['data'] = {key: result[key] for key in SPLIT_KEYS}
+    # A stopped race keeps the scores collected above but never queues another rung
+    if pending or race['finished']:
+        return
+    
+    if race['rung'] == len(race['schedule']) - 1:
+        race['finished'] = True
+        return
+    alive = sorted(
+        (name for name, candidate in race['candidates'].items()
+         if candidate['status'] == 'done' and candidate['rung'] == race['rung']),
+        key=lambda name: race['candidates'][name]['score'],
+        reverse=True
+    )
+    keep = max(1, -(-len(alive) // RACE_HALVING_FACTOR))
+    for name in alive[keep:]:
+        race['candidates'][name]['status'] = 'stopped'
+    race['rung'] += 1
+    for name in alive[:keep]:
+        _submit_race_job(runner, race, name)
+    if not alive:
+        race['finished'] = True
+
+
+def stop_race(runner, race):
+    """End the race at its current rung: collect finished jobs and cancel the rest"""
+    race['stopped'] = True
+    race['finished'] = True
+    advance_race(runner, race)
+    for candidate in race['candidates'].values():
+        if candidate.get('job_id') is not None:
+            runner.cancel(candidate['job_id'])
+            candidate.update(job_id=None, status='cancelled')
+
+
+def race_leaderboard(race, metric_name):
+    """Leaderboard rows sorted by rung reached, then the primary metric; unscored candidates last"""
+    rows = []
+    for name, candidate in race['candidates'].items():
+        rows.append({
+            'rung': candidate.get('rung', 0),
+            'Model': name,
+            'Status': RACE_STATUS_ICONS[candidate['status']],
+            'Rung': f"{candidate.get('rung', 0) + 1}/{len(race['schedule'])}",
+            'Train Rows': candidate.get('train_rows'),
+            metric_name: candidate['score'],
+            'Fit Time (s)': candidate['fit_seconds'],
+        })
+    # Scores from earlier rungs come from smaller training sets, so they rank below later rungs
+    leaderboard = pd.DataFrame(rows).sort_values(['rung', metric_name], ascending=False, na_position='last')
+    leaderboard = leaderboard.drop(columns='rung')
+    leaderboard.insert(0, 'Rank', range(1, len(leaderboard) + 1))
+    return leaderboard.round(4)
+
+
+def render_leaderboard(race):
+    metric_name = "R² Score" if race['args'][3] else "Accuracy"
+    st.dataframe(race_leaderboard(race, metric_name), use_container_width=True, hide_index=True)
+    st.caption(f"Successive halving over {len(race['schedule'])} rung(s) of "
+               f"{', '.join(f'{rows:,}' for rows in race['schedule'])} training rows · "
+               f"{time.time() - race['started']:.1f}s elapsed")
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def race_progress_panel():
+    """Live leaderboard while the race runs; reruns the page when it finishes"""
+    runner = get_training_runner()
+    race = st.session_state.race
+    advance_race(runner, race)
+    if race['finished']:
+        st.rerun()
+    
+    st.markdown(f"#### 🏁 Racing {len(race['candidates'])} models · rung {race['rung'] + 1}/{len(race['schedule'])}")
+    render_leaderboard(race)
+    if st.button("⛔ STOP RACE", use_container_width=True):
+        stop_race(runner, race)
+
+
+def race_results_panel():
+    """Final (or stopped) leaderboard with promotion of any scored model to the session"""
+    race = st.session_state.race
+    if race['stopped']:
+        st.markdown(f"#### ⛔ Race stopped at rung {race['rung'] + 1}/{len(race['schedule'])}")
+    else:
+        st.markdown("#### 🏆 Leaderboard")
+    render_leaderboard(race)
+    
+    promotable = [name for name, candidate in race['candidates'].items() if candidate['result'] is not None]
+    if not promotable:
+        st.warning("⚠️ No model finished a rung before the race ended.")
+        return
+    promotable.sort(key=lambda name: race['candidates'][name]['score'], reverse=True)
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        chosen = st.selectbox("🥇 Model to promote", promotable, label_visibility="collapsed")
+    with col2:
+        if st.button("⬆️ PROMOTE", use_container_width=True):
+            df, test_size = race['args'][0], race['args'][4]
+            # Stopped before any final-rung job shipped the split; the seeded split is the same here
+            data = race['data'] or dict(zip(SPLIT_KEYS, split_positions(len(df), test_size)))
+            apply_training_result({**race['candidates'][chosen]['result'], **data}, df)
+            st.session_state.training_notice = f"✅ Promoted **{chosen}** to the active model."
+            st.rerun()
+    if race['candidates'][chosen]['train_rows'] < race['schedule'][-1]:
+        st.caption(f"ℹ️ {chosen} was stopped early and trained on "
+                   f"{race['candidates'][chosen]['train_rows']:,} rows only.")
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🎛️ HYPERPARAMETER TUNING
+# ═══════════════════════════════════════════════════════════════════════════
+
+_FOREST_SPACE = {
+    'n_estimators': randint(50, 400),
+    'max_depth': [None, 5, 10, 20, 40],
+    'min_samples_leaf': randint(1, 10),
+    'max_features': ['sqrt', 'log2', 1.0],
+}
+_BOOSTING_SPACE = {
+    'n_estimators': randint(50, 400),
+    'learning_rate': loguniform(0.01, 0.3),
+    'max_depth': randint(2, 6),
+    'subsample': uniform(0.6, 0.4),
+}
+_HIST_BOOSTING_SPACE = {
+    'learning_rate': loguniform(0.01, 0.3),
+    'max_leaf_nodes': randint(15, 127),
+    'min_samples_leaf': randint(5, 100),
+    'l2_regularization': loguniform(1e-4, 10),
+}
+SEARCH_SPACES = {
+    "Random Forest": _FOREST_SPACE,
+    "Random Forest Regressor": _FOREST_SPACE,
+    "Gradient Boosting": _BOOSTING_SPACE,
+    "Gradient Boosting Regressor": _BOOSTING_SPACE,
+    "Hist Gradient Boosting": _HIST_BOOSTING_SPACE,
+    "Hist Gradient Boosting Regressor": _HIST_BOOSTING_SPACE,
+    "Logistic Regression": {'C': loguniform(1e-3, 1e2)},
+    "Linear Regression": {'fit_intercept': [True, False]},
+    "Ridge": {'alpha': loguniform(1e-3, 1e3)},
+    "Lasso": {'alpha': loguniform(1e-4, 1e1)},
+    "SVR": {'C': loguniform(1e-2, 1e3), 'gamma': loguniform(1e-4, 1), 'epsilon': loguniform(1e-3, 1)},
+}
+TUNING_CANDIDATES = 27
+TUNING_BUDGET_SECONDS = 120
+
+
+def cv_folds(y, n_splits, stratified):
+    """Shuffled (stratified) K-fold indices; falls back to plain K-fold when a class is too rare"""
+    if stratified:
+        try:
+            return list(StratifiedKFold(n_splits, shuffle=True, random_state=42).split(np.zeros(len(y)), y))
+        except ValueError:
+            pass
+    return list(KFold(n_splits, shuffle=True, random_state=42).split(np.zeros(len(y))))
+
+
+def score_candidate(model_type, is_regression, params, X, y, train_idx, val_idx):
+    """Fit one candidate on one fold and return its validation score; indices are absolute rows of X"""
+    model = build_model(model_type, is_regression).set_params(**params)
+    model.fit(X[train_idx], y[train_idx])
+    return model.score(X[val_idx], y[val_idx])
+
+
+def run_tuning_job(job_id, progress, cancelled, df, features, target, model_type, is_regression, test_size,
+                   n_jobs=1, fingerprint=None, n_candidates=TUNING_CANDIDATES, n_splits=3,
+                   time_budget=TUNING_BUDGET_SECONDS):
+    """Worker entry point: successive-halving random search within a wall-clock budget.
+    
+    Candidates are cross-validated on growing prefixes of the training split,
+    keeping the best third per rung. The encoded matrix and each rung's folds
+    are built once and shared by every candidate; joblib memory-maps the
+    matrix into its workers. The best parameters are refitted on the full
+    training split and scored on the test split like any other job.
+    """
+    report = job_reporter(job_id, progress, cancelled)
+    deadline = time.monotonic() + time_budget
+    
+    report(0.02, "Encoding features")
+    X_train, X_test, y_train, y_test, encoder = training_split(fingerprint, df, features, target, test_size)
+    X_values = X_train.to_numpy(dtype=np.float64, na_value=np.nan)
+    y_values = y_train.to_numpy()
+    
+    candidates = list(ParameterSampler(SEARCH_SPACES[model_type], n_iter=n_candidates, random_state=42))
+    schedule = race_schedule(len(X_values), len(candidates))
+    alive = list(range(len(candidates)))
+    history = []
+    best_params, best_score, out_of_time = {}, None, False
+    batch_size = max(1, n_jobs)
+    
+    with tempfile.TemporaryDirectory(prefix="novacore-tuning-") as scratch:
+        if n_jobs > 1:
+            X_values, y_values = memmap_for_workers(scratch, X_values, y_values)
+        with Parallel(n_jobs=n_jobs) as parallel:
+            for rung, rows in enumerate(schedule):
+                folds = cv_folds(y_values[:rows], n_splits, not is_regression)
+                scores = {}
+                for start in range(0, len(alive), batch_size):
+                    if time.monotonic() > deadline:
+                        out_of_time = True
+                        break
+                    batch = alive[start:start + batch_size]
+                    fold_scores = parallel(
+                        delayed(score_candidate)(model_type, is_regression, candidates[index],
+                                                 X_values, y_values, train_idx, val_idx)
+                        for index in batch for train_idx, val_idx in folds
+                    )
+                    for offset, index in enumerate(batch):
+                        cv_scores = fold_scores[offset * n_splits:(offset + 1) * n_splits]
+                        scores[index] = (float(np.mean(cv_scores)), float(np.std(cv_scores)))
+                        history.append({'rung': rung + 1, 'rows': rows, 'candidate': index,
+                                        'mean_score': scores[index][0], 'std_score': scores[index][1],
+                                        'params': candidates[index]})
+                    rung_best = max(scores, key=lambda index: scores[index][0])
+                    best_params, best_score = candidates[rung_best], scores[rung_best][0]
+                    elapsed = 1 - (deadline - time.monotonic()) / time_budget
+                    done = (rung + len(scores) / len(alive)) / len(schedule)
+                    report(0.05 + 0.8 * max(done, min(elapsed, 1.0)),
+                           f"Rung {rung + 1}/{len(schedule)} · {len(scores)}/{len(alive)} candidates · "
+                           f"best CV score {best_score:.4f}")
+                if out_of_time or not scores:
+                    break
+                ranked = sorted(scores, key=lambda index: scores[index][0], reverse=True)
+                alive = ranked[:max(1, -(-len(ranked) // RACE_HALVING_FACTOR))]
+    
+    report(0.88, "Refitting the best candidate on the full training split")
+    model = build_model(model_type, is_regression, n_jobs).set_params(**best_params)
+    started = time.perf_counter()
+    with threadpool_limits(limits=n_jobs):
+        model.fit(X_train, y_train)
+        fit_seconds = time.perf_counter() - started
+        score = model.score(X_test, y_test)
+    train_index, test_index = split_positions(len(df), test_size)
+    return {
+        'model': model,
+        'train_index': train_index,
+        'test_index': test_index,
+        'feature_names': features,
+        'target_name': target,
+        'encoder': encoder,
+        'is_regression': is_regression,
+        'problem_type': "Regression" if is_regression else "Classification",
+        'model_fingerprint': fingerprint,
+        'score': score,
+        'fit_seconds': fit_seconds,
+        'train_rows': len(X_train),
+        'search': {
+            'model_type': model_type,
+            'best_params': {key: _to_builtin(value) for key, value in best_params.items()},
+            'best_cv_score': best_score,
+            'test_score': score,
+            'history': pd.DataFrame(history),
+            'out_of_time': out_of_time,
+        },
+    }
+
+
+def render_tuning_results(search, metric_name):
+    """Best parameters and the top of the search history"""
+    st.markdown(f"#### 🎛️ Tuning Results · {search['model_type']}")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        best_cv = search['best_cv_score']
+        st.metric(f"Best CV {metric_name}", f"{best_cv:.4f}" if best_cv is not None else "—")
+    with col2:
+        st.metric(f"Test {metric_name}", f"{search['test_score']:.4f}")
+    with col3:
+        st.metric("Candidates Evaluated", len(search['history']))
+    if search['out_of_time']:
+        st.caption("⏱️ The time budget ran out before the search finished; showing the best so far.")
+    st.json(search['best_params'])
+    
+    history = search['history']
+    if len(history) > 0:
+        top = history.sort_values(['rung', 'mean_score'], ascending=False).head(10)
+        top = top.assign(params=top['params'].map(lambda params: json.dumps(params, default=_to_builtin)))
+        st.dataframe(top.round(4), use_container_width=True, hide_index=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🔁 CROSS-VALIDATION
+# ═══════════════════════════════════════════════════════════════════════════
+
+CV_FOLD_OPTIONS = [3, 5, 10]
+
+
+def fold_predictions(model_type, is_regression, X, y, train_idx, val_idx):
+    """Fit one fold and predict its held-out rows; returns (val_idx, predictions, classes, probabilities)"""
+    model = build_model(model_type, is_regression).fit(X[train_idx], y[train_idx])
+    proba = model.predict_proba(X[val_idx]) if hasattr(model, 'predict_proba') else None
+    return val_idx, model.predict(X[val_idx]), getattr(model, 'classes_', None), proba
+
+
+def run_cv_job(job_id, progress, cancelled, df, features, target, model_type, is_regression, n_splits=5,
+               n_jobs=1, fingerprint=None):
+    """Worker entry point: K-fold (stratified for classification) evaluation with folds fitted in parallel.
+    
+    Returns the usual handoff for a final model fitted on all rows, plus
+    out-of-fold predictions and probabilities that the Model Performance
+    section evaluates without touching the model again.
+    """
+    report = job_reporter(job_id, progress, cancelled)
+    
+    report(0.02, "Encoding features")
+    X, y, encoder = training_matrix(fingerprint, df, features, target)
+    X_values = X.to_numpy(dtype=np.float64, na_value=np.nan)
+    y_values = y.to_numpy()
+    folds = cv_folds(y_values, n_splits, not is_regression)
+    
+    fold_ids = np.empty(len(y_values), dtype=np.int8)
+    oof_pred = np.empty(len(y_values), dtype=np.float64 if is_regression else y_values.dtype)
+    classes = None if is_regression else np.unique(y_values)
+    oof_proba = None
+    with tempfile.TemporaryDirectory(prefix="novacore-cv-") as scratch:
+        if n_jobs > 1:
+            X_values, y_values = memmap_for_workers(scratch, X_values, y_values)
+        with Parallel(n_jobs=min(n_jobs, n_splits), return_as='generator') as parallel:
+            outputs = parallel(
+                delayed(fold_predictions)(model_type, is_regression, X_values, y_values, train_idx, val_idx)
+                for train_idx, val_idx in folds
+            )
+            for fold, (val_idx, pred, fold_classes, proba) in enumerate(outputs):
+                fold_ids[val_idx] = fold
+                oof_pred[val_idx] = pred
+                if proba is not None:
+                    if oof_proba is None:
+                        oof_proba = np.zeros((len(y_values), len(classes)))
+                    # A fold may miss a rare class; line its columns up with the full class list
+                    oof_proba[np.ix_(val_idx, np.searchsorted(classes, fold_classes))] = proba
+                report(0.05 + 0.7 * (fold + 1) / n_splits, f"Fold {fold + 1}/{n_splits} done")
+    
+    model = build_model(model_type, is_regression, n_jobs)
+    started = time.perf_counter()
+    with threadpool_limits(limits=n_jobs):
+        fit_staged(model, X, y,
+                   lambda done: report(0.75 + 0.25 * done, f"Fitting final {model_type} on all rows ({done:.0%})"))
+    fit_seconds = time.perf_counter() - started
+    y_true = y.to_numpy()
+    oof_score = r2_score(y_true, oof_pred) if is_regression else accuracy_score(y_true, oof_pred)
+    return {
+        'model': model,
+        'feature_names': features,
+        'target_name': target,
+        'encoder': encoder,
+        'is_regression': is_regression,
+        'problem_type': "Regression" if is_regression else "Classification",
+        'model_fingerprint': fingerprint,
+        'score': oof_score,
+        'fit_seconds': fit_seconds,
+        'train_rows': len(X),
+        'cv_results': {
+            'n_splits': n_splits,
+            'fold': fold_ids,
+            'y_true': y_true,
+            'y_pred': oof_pred,
+            'y_proba': oof_proba,
+            'classes': classes,
+        },
+    }
+
+
+def regression_metrics(y_true, y_pred):
+    mse = mean_squared_error(y_true, y_pred)
+    return {
+        "📊 MAE": mean_absolute_error(y_true, y_pred),
+        "📊 MSE": mse,
+        "📊 RMSE": np.sqrt(mse),
+        "📊 R² Score": r2_score(y_true, y_pred),
+    }
+
+
+def classification_metrics(y_true, y_pred):
+    return {
+        "🎯 Accuracy": accuracy_score(y_true, y_pred),
+        "🎯 Precision": precision_score(y_true, y_pred, average='weighted', zero_division=0),
+        "🎯 Recall": recall_score(y_true, y_pred, average='weighted', zero_division=0),
+        "🎯 F1-Score": f1_score(y_true, y_pred, average='weighted', zero_division=0),
+    }
+
+
+def fold_metric_summary(metric_fn, y_true, y_pred, fold_ids, n_splits):
+    """(mean, std) of every metric across folds, computed from out-of-fold predictions"""
+    per_fold = [metric_fn(y_true[fold_ids == fold], y_pred[fold_ids == fold]) for fold in range(n_splits)]
+    return {name: (np.mean([scores[name] for scores in per_fold]), np.std([scores[name] for scores in per_fold]))
+            for name in per_fold[0]}
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📋 EVALUATION BUNDLE
+# ═══════════════════════════════════════════════════════════════════════════
+
+def compute_evaluation(model, is_regression, X_test, y_test, cv=None, feature_names=None):
+    """Everything the Model Performance section draws, computed once per trained model.
+    
+    Holds predictions, probabilities, ROC points and feature importances.
+    After cross-validation these come from the out-of-fold arrays, so the model
+    is not touched. Threshold-dependent metrics are added lazily by
+    ``evaluation_at_threshold``.
+    """
+    if cv is not None:
+        y_true, y_pred, y_proba, classes = cv['y_true'], cv['y_pred'], cv['y_proba'], cv['classes']
+    else:
+        y_true = y_test.to_numpy()
+        y_pred = model.predict(X_test)
+        classes = getattr(model, 'classes_', None)
+        y_proba = model.predict_proba(X_test) if not is_regression and hasattr(model, 'predict_proba') else None
+    
+    is_binary = not is_regression and len(np.unique(y_true)) == 2
+    y_score = y_proba[:, 1] if is_binary and y_proba is not None and y_proba.shape[1] == 2 else None
+    bundle = {
+        'model': model,
+        'is_regression': is_regression,
+        'cv': None if cv is None else {'n_splits': cv['n_splits'], 'fold': cv['fold']},
+        'y_true': y_true,
+        'y_pred': y_pred,
+        'classes': classes,
+        'y_score': y_score,
+        'roc': None,
+        'roc_error': None,
+        'importance': None,
+        'by_threshold': {},
+    }
+    if y_score is not None:
+        try:
+            fpr, tpr, _ = roc_curve(y_true, y_score, pos_label=classes[1])
+            bundle['roc'] = (fpr, tpr, roc_auc_score(y_true, y_score))
+        except Exception as e:
+            bundle['roc_error'] = str(e)
+    if hasattr(model, 'feature_importances_'):
+        bundle['importance'] = pd.DataFrame({
+            'Feature': feature_names,
+            'Importance': model.feature_importances_
+        }).sort_values('Importance', ascending=False)
+    return bundle
+
+
+def evaluation_at_threshold(bundle, threshold):
+    """Metrics and confusion matrix at a probability threshold, memoized in the bundle"""
+    key = threshold if bundle['y_score'] is not None else None
+    if key in bundle['by_threshold']:
+        return bundle['by_threshold'][key]
+    
+    y_true, y_pred = bundle['y_true'], bundle['y_pred']
+    if bundle['y_score'] is not None:
+        y_pred = bundle['classes'][(bundle['y_score'] >= threshold).astype(int)]
+    metric_fn = regression_metrics if bundle['is_regression'] else classification_metrics
+    cv = bundle['cv']
+    if cv is not None:
+        summary = fold_metric_summary(metric_fn, y_true, y_pred, cv['fold'], cv['n_splits'])
+        metrics = {name: mean for name, (mean, std) in summary.items()}
+        values = {name: f"{mean:.3f} ± {std:.3f}" for name, (mean, std) in summary.items()}
+    else:
+        metrics = metric_fn(y_true, y_pred)
+        values = {name: f"{value:.3f}" for name, value in metrics.items()}
+    result = bundle['by_threshold'][key] = {
+        'metrics': metrics,
+        'values': values,
+        'confusion': None if bundle['is_regression'] else confusion_matrix(y_true, y_pred),
+    }
+    return result
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🗃️ MODEL REGISTRY
+# ═══════════════════════════════════════════════════════════════════════════
+
+MODEL_REGISTRY_DIR = os.environ.get(
+    "NOVACORE_MODEL_DIR", os.path.join(os.path.expanduser("~"), ".cache", "novacore", "models")
+)
+MODEL_ARTIFACT_VERSION = 2
+# High-cardinality categorical features keep only their first values in a schema
+SCHEMA_MAX_CATEGORIES = 1000
+
+
+def compute_feature_schema(df, features):
+    """Input schema of a model: range and mean of numeric features, observed values of categorical ones"""
+    schema = {}
+    for feature in features:
+        series = df[feature]
+        if is_numeric_column(series):
+            schema[feature] = {'kind': 'numeric', 'min': float(series.min()), 'max': float(series.max()),
+                               'mean': float(series.mean())}
+        else:
+            values = series.dropna().unique()[:SCHEMA_MAX_CATEGORIES]
+            schema[feature] = {'kind': 'categorical', 'values': [_to_builtin(value) for value in values]}
+    return schema
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def _cached_feature_schema(fingerprint, features, _df):
+    return compute_feature_schema(_df, list(features))
+
+
+def get_feature_schema(df, fingerprint, features):
+    if fingerprint is None:
+        return compute_feature_schema(df, features)
+    return _cached_feature_schema(fingerprint, tuple(features), df)
+
+
+class ModelRegistry:
+    """Versioned on-disk model artifacts laid out as ``<root>/<name>/v<version>/``.
+    
+    Each version holds a ``manifest.json`` (feature schema, metrics, dataset
+    fingerprint) and an uncompressed ``model.joblib`` with the estimator and its
+    encoder, so the NumPy arrays inside load memory-mapped. Listing only reads
+    manifests; artifacts are loaded when a version is first used.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    @staticmethod
+    def slug(name):
+        """Directory-safe form of a model name"""
+        return "".join(c if c.isalnum() or c in "-_." else "-" for c in name.strip()).strip("-.") or "model"
+
+    def versions(self, name):
+        path = os.path.join(self.root, name)
+        if not os.path.isdir(path):
+            return []
+        return sorted(int(entry[1:]) for entry in os.listdir(path) if entry[:1] == 'v' and entry[1:].isdigit())
+
+    def manifests(self):
+        """Manifest of every registered version, newest first within each name"""
+        entries = []
+        for name in sorted(os.listdir(self.root)):
+            for version in reversed(self.versions(name)):
+                try:
+                    with open(os.path.join(self.root, name, f"v{version}", 'manifest.json')) as f:
+                        entries.append(json.load(f))
+                except (OSError, ValueError):
+                    continue
+        return entries
+
+    def save(self, name, model, encoder, manifest):
+        """Register the next version of ``name``; returns its completed manifest"""
+        name = self.slug(name)
+        parent = os.path.join(self.root, name)
+        os.makedirs(parent, exist_ok=True)
+        # Staged in a hidden directory and renamed into place, so readers never see half a version
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=parent)
+        try:
+            joblib.dump({'model': model, 'encoder': encoder}, os.path.join(staging, 'model.joblib'))
+            while True:
+                version = max(self.versions(name), default=0) + 1
+                manifest = {**manifest, 'name': name, 'version': version, 'format': MODEL_ARTIFACT_VERSION,
+                            'created': time.strftime('%Y-%m-%d %H:%M:%S')}
+                with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+                    json.dump(manifest, f, default=str)
+                target = os.path.join(parent, f"v{version}")
+                try:
+                    os.rename(staging, target)
+                    return manifest
+                except OSError as e:
+                    # Another session registered this version first; take the next one.
+                    # Anything else (permissions, full disk) propagates so staging is removed
+                    if e.errno in (errno.EEXIST, errno.ENOTEMPTY) or os.path.exists(target):
+                        continue
+                    raise
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+    def load(self, name, version):
+        """(model, encoder, manifest) of one version, with arrays memory-mapped"""
+        path = os.path.join(self.root, name, f"v{version}")
+        with open(os.path.join(path, 'manifest.json')) as f:
+            manifest = json.load(f)
+        if manifest.get('format') != MODEL_ARTIFACT_VERSION:
+            raise ValueError(f"{name} v{version} uses artifact format {manifest.get('format')}, "
+                             f"expected {MODEL_ARTIFACT_VERSION}")
+        artifact = joblib.load(os.path.join(path, 'model.joblib'), mmap_mode='r')
+        return artifact['model'], artifact['encoder'], manifest
+
+
+@st.cache_resource
+def get_model_registry():
+    """Shared model registry for all sessions on this server"""
+    return ModelRegistry(MODEL_REGISTRY_DIR)
+
+
+@st.cache_resource(max_entries=8, show_spinner="Loading registered model...")
+def load_registered_model(name, version):
+    """A registered version, loaded once per server process and shared by every session"""
+    return get_model_registry().load(name, version)
+
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📦 BATCH SCORING
+# ═══════════════════════════════════════════════════════════════════════════
+
+SCORING_CHUNK_ROWS = 50_000
+SCORING_DIR = os.path.join(tempfile.gettempdir(), "novacore-scoring")
+
+
+def stream_parquet_chunks(data, chunk_rows=STREAM_CHUNK_ROWS):
+    """Yield (chunk, fraction_read) from Parquet bytes one record batch at a time"""
+    parquet_file = pq.ParquetFile(pa.BufferReader(data))
+    total = max(parquet_file.metadata.num_rows, 1)
+    rows = 0
+    for batch in parquet_file.iter_batches(batch_size=chunk_rows):
+        rows += batch.num_rows
+        yield batch.to_pandas(), min(rows / total, 1.0)
+
+
+def score_chunk(model, encoder, feature_names, chunk):
+    """A chunk of new rows with its predictions (and class probabilities) appended"""
+    X = encoder.transform(chunk[feature_names])
+    if not hasattr(model, 'predict_proba'):
+        return chunk.assign(prediction=model.predict(X))
+    # Classifiers predict the most probable class, so one predict_proba pass yields both
+    proba = model.predict_proba(X)
+    prediction = model.classes_.take(proba.argmax(axis=1))
+    classes = model.classes_
+    if encoder.classes_ is not None:
+        prediction = encoder.decode_target(prediction)
+        classes = encoder.decode_target(classes)
+    scored = chunk.assign(prediction=prediction)
+    for i, label in enumerate(classes):
+        scored[f"probability_{label}"] = proba[:, i]
+    return scored
+
+
+def run_scoring_job(job_id, progress, cancelled, name, data, model, encoder, feature_names, out_path,
+                    n_jobs=1):
+    """Worker entry point: stream an upload through the model chunk by chunk into a gzipped CSV.
     
-    selected_col = st.selectbox("Select column for distribution", numeric_df.columns.tolist())
+    Chunks are scored on ``n_jobs`` threads - tree and linear predictors release
+    the GIL, and threads share the one copy of the model - while only the
+    chunks in flight are ever held in memory.
+    """
+    report = job_reporter(job_id, progress, cancelled)
+    format_info = None if name.endswith('.parquet') else sniff_csv_format(data)
+    if 'n_jobs' in model.get_params():
+        # Parallelism comes from the chunks; nested forest threads would only oversubscribe
+        model.set_params(n_jobs=1)
     
-    col1, col2 = st.columns(2)
+    started = time.perf_counter()
+    while True:
+        if format_info is None:
+            chunks = stream_parquet_chunks(data, SCORING_CHUNK_ROWS)
+        else:
+            chunks = stream_csv_chunks(data, format_info, SCORING_CHUNK_ROWS)
+        try:
+            rows = write_scored_chunks(chunks, model, encoder, feature_names, out_path, n_jobs, report)
+            break
+        except UnicodeDecodeError:
+            if format_info is None or format_info['encoding'] == 'latin-1':
+                raise
+            # Same fallback as the full parse: latin-1 decodes any byte sequence, so start over with it
+            format_info.update(encoding='latin-1', confidence=0.5)
+    return {'name': name, 'path': out_path, 'rows': rows, 'seconds': time.perf_counter() - started}
+
+
+def write_scored_chunks(chunks, model, encoder, feature_names, out_path, n_jobs, report):
+    """Score ``chunks`` on ``n_jobs`` threads into a gzipped CSV at ``out_path``; returns the row count"""
+    fractions = []
     
-    with col1:
-        # Histogram
-        fig = px.histogram(
-            df, x=selected_col,
-            template="plotly_dark",
-            color_discrete_sequence=['#8B5CF6']
-        )
-        fig.update_layout(
-            title=f"Distribution of {selected_col}",
-            plot_bgcolor='#0E1117',
-            paper_bgcolor='#0E1117',
-            font=dict(color='#FAFAFA')
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    def tasks():
+        for chunk, fraction in chunks:
+            missing = [feature for feature in feature_names if feature not in chunk.columns]
+            if missing:
+                raise ValueError(f"Missing feature column(s): {', '.join(map(str, missing))}")
+            fractions.append(fraction)
+            yield delayed(score_chunk)(model, encoder, feature_names, chunk)
     
-    with col2:
-        # Box plot
-        fig = px.box(
-            df, y=selected_col,
-            template="plotly_dark",
-            color_discrete_sequence=['#00C9FF']
-        )
-        fig.update_layout(
-            title=f"Box Plot of {selected_col}",
-            plot_bgcolor='#0E1117',
-            paper_bgcolor='#0E1117',
-            font=dict(color='#FAFAFA')
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    rows = 0
+    report(0.0, "Reading rows")
+    # Fastest gzip level: prediction columns compress well and scoring throughput matters more
+    with gzip.open(out_path, 'wt', newline='', compresslevel=1) as out, threadpool_limits(limits=1), \
+            Parallel(n_jobs=n_jobs, prefer='threads', return_as='generator') as parallel:
+        for i, scored in enumerate(parallel(tasks())):
+            scored.to_csv(out, header=i == 0, index=False, float_format='%.6g')
+            rows += len(scored)
+            report(fractions[i], f"Scored {rows:,} rows")
+    return rows
 
-# ═══════════════════════════════════════════════════════════════════════════
-# 🧹 SMART DATA CLEANING MODULE
-# ═══════════════════════════════════════════════════════════════════════════
 
-def smart_data_cleaning_page():
-    """Automated data cleaning with one-click functionality"""
-    st.markdown('<h1 class="glow-text">🧹 Smart Data Cleaning Lab</h1>', unsafe_allow_html=True)
-    st.markdown("---")
+def prune_scoring_outputs():
+    """Delete prediction files older than the job result TTL"""
+    cutoff = time.time() - JOB_RESULT_TTL_SECONDS
+    for entry in os.scandir(SCORING_DIR):
+        if entry.stat().st_mtime < cutoff:
+            os.remove(entry.path)
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def scoring_job_panel():
+    """Live status of the session's scoring job; keeps its output file once it finishes"""
+    runner = get_training_runner()
+    job_id = st.session_state.scoring_job
+    status = runner.status(job_id)
+    if status is None:
+        st.session_state.scoring_job = None
+        st.rerun()
     
-    if st.session_state.df is None:
-        st.warning("⚠️ Please upload a dataset first in the Data Ingestion section!")
+    if status['state'] in ('queued', 'running'):
+        st.markdown(f"#### ⏳ {status['label']} · job `{job_id}`")
+        st.progress(min(status['progress'], 1.0), text=status['message'])
+        st.caption(f"{status['state'].title()} for {status['elapsed']:.1f}s")
+        if st.button("⛔ CANCEL SCORING", use_container_width=True):
+            runner.cancel(job_id)
         return
     
-    df = st.session_state.df.copy()
+    st.session_state.scoring_job = None
+    if status['state'] == 'done':
+        st.session_state.scoring_result = runner.result(job_id)
+    else:
+        runner.forget(job_id)
+        st.session_state.scoring_notice = (
+            f"❌ Error scoring file: {str(status['error'])}" if status['state'] == 'failed' else "⛔ Scoring cancelled."
+        )
+    st.rerun()
+
+
+def batch_scoring_view(model, encoder, feature_names):
+    """Score an uploaded CSV/Parquet file in the background and offer the predictions for download"""
+    runner = get_training_runner()
+    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+    upload = st.file_uploader(
+        "📤 Rows to score",
+        type=['csv', 'parquet'] if HAS_PYARROW else ['csv'],
+        key="scoring_upload",
+        help="The file is streamed through the model in chunks of "
+             f"{SCORING_CHUNK_ROWS:,} rows; extra columns are passed through"
+    )
+    st.caption(f"Required columns: {', '.join(map(str, feature_names))}")
+    st.markdown('</div>', unsafe_allow_html=True)
     
-    # Missing Values Analysis
-    st.markdown("### 🔍 Missing Values Analysis")
+    if upload is not None and st.button("📦 SCORE FILE", use_container_width=True):
+        if st.session_state.scoring_job is not None:
+            runner.cancel(st.session_state.scoring_job)
+            runner.forget(st.session_state.scoring_job)
+        os.makedirs(SCORING_DIR, exist_ok=True)
+        prune_scoring_outputs()
+        st.session_state.scoring_result = None
+        st.session_state.scoring_job = runner.submit(
+            run_scoring_job, f"Scoring {upload.name}",
+            upload.name, upload.getvalue(), model, encoder, list(feature_names),
+            os.path.join(SCORING_DIR, f"{uuid.uuid4().hex[:12]}.csv.gz"), st.session_state.core_budget
+        )
     
-    missing_data = df.isnull().sum()
-    total_missing = missing_data.sum()
+    if st.session_state.scoring_job is not None:
+        scoring_job_panel()
     
-    if total_missing > 0:
-        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-        
-        missing_df = pd.DataFrame({
-            'Column': missing_data[missing_data > 0].index,
-            'Missing Count': missing_data[missing_data > 0].values,
-            'Percentage': (missing_data[missing_data > 0].values / len(df) * 100).round(2)
-        })
+    notice = st.session_state.pop('scoring_notice', None)
+    if notice is not None and notice.startswith("❌"):
+        st.error(notice)
+    elif notice is not None:
+        st.warning(notice)
+    
+    result = st.session_state.scoring_result
+    if result is not None and os.path.exists(result['path']):
+        st.success(f"✅ Scored {result['rows']:,} rows of **{result['name']}** in {result['seconds']:.1f}s "
+                   f"({result['rows'] / max(result['seconds'], 1e-9):,.0f} rows/s)")
         
-        st.dataframe(missing_df, use_container_width=True)
-        st.markdown('</div>', unsafe_allow_html=True)
+        def read_predictions():
+            with open(result['path'], 'rb') as f:
+                return f.read()
         
-        # Visualization of missing values
-        fig = px.bar(
-            missing_df,
-            x='Column',
-            y='Percentage',
-            title='Missing Values by Column (%)',
-            template='plotly_dark',
-            color='Percentage',
-            color_continuous_scale='Reds'
-        )
-        fig.update_layout(
-            plot_bgcolor='#0E1117',
-            paper_bgcolor='#0E1117',
-            font=dict(color='#FAFAFA')
+        # Read from disk only when clicked, rather than holding the whole file in memory on every rerun
+        st.download_button(
+            "⬇️ Download Predictions",
+            read_predictions if DEFERRED_DOWNLOADS else read_predictions(),
+            file_name=f"{os.path.splitext(result['name'])[0]}-predictions.csv.gz",
+            mime="application/gzip",
+            use_container_width=True
         )
-        st.plotly_chart(fig, use_container_width=True)
-        
-    else:
-        st.success("✅ No missing values detected!")
-    
-    # Duplicate Analysis
-    st.markdown("---")
-    st.markdown("### 🔄 Duplicate Rows Analysis")
-    
-    duplicates = df.duplicated().sum()
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Total Duplicate Rows", duplicates)
-    with col2:
-        st.metric("Percentage", f"{(duplicates / len(df) * 100):.2f}%")
-    
-    # One-Click Clean Button
-    st.markdown("---")
-    st.markdown("### 🚀 Automated Cleaning")
-    
-    st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-    st.markdown("""
-    **The One-Click Cleaner will:**
-    - 🔢 Fill numeric missing values with **Median**
-    - 🏷️ Fill categorical missing values with **Mode**
-    - 🗑️ Remove duplicate rows
-    - ✨ Optimize data types
-    """)
-    
-    if st.button("🧹 ONE-CLICK CLEAN", use_container_width=True):
-        with st.spinner("🔄 Cleaning data..."):
-            cleaned_df = df.copy()
-            
-            # Fill numeric columns with median
-            numeric_cols = cleaned_df.select_dtypes(include=[np.number]).columns
-            for col in numeric_cols:
-                if cleaned_df[col].isnull().sum() > 0:
-                    cleaned_df[col].fillna(cleaned_df[col].median(), inplace=True)
-            
-            # Fill categorical columns with mode
-            categorical_cols = cleaned_df.select_dtypes(include=['object', 'category']).columns
-            for col in categorical_cols:
-                if cleaned_df[col].isnull().sum() > 0:
-                    mode_value = cleaned_df[col].mode()
-                    if len(mode_value) > 0:
-                        cleaned_df[col].fillna(mode_value[0], inplace=True)
-            
-            # Remove duplicates
-            original_rows = len(cleaned_df)
-            cleaned_df.drop_duplicates(inplace=True)
-            removed_duplicates = original_rows - len(cleaned_df)
-            
-            # Update session state
-            st.session_state.cleaned_df = cleaned_df
-            
-            st.success(f"""
-            ✅ **Data Cleaning Complete!**
-            - 🗑️ Removed {removed_duplicates} duplicate rows
-            - 📊 Final dataset: {len(cleaned_df)} rows × {len(cleaned_df.columns)} columns
-            - 💾 Memory optimized: {cleaned_df.memory_usage(deep=True).sum() / 1024:.2f} KB
-            """)
-            
-            # Show before/after comparison
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Original Rows", original_rows)
-                st.metric("Original Missing Values", total_missing)
-            with col2:
-                st.metric("Cleaned Rows", len(cleaned_df))
-                st.metric("Remaining Missing Values", cleaned_df.isnull().sum().sum())
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Preview cleaned data
-    if st.session_state.cleaned_df is not None:
-        st.markdown("---")
-        st.markdown("### ✨ Cleaned Data Preview")
-        st.dataframe(st.session_state.cleaned_df.head(10), use_container_width=True)
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 🧠 MODEL ENGINE MODULE
@@ -713,7 +3899,12 @@ def model_engine_page():
         st.warning("⚠️ Please upload a dataset first in the Data Ingestion section!")
         return
     
-    df = st.session_state.cleaned_df if st.session_state.cleaned_df is not None else st.session_state.df
+    df, fingerprint = active_dataset()
+    runner = get_training_runner()
+    
+    # A reconnecting browser picks its running job back up from the URL
+    if st.session_state.training_job is None and runner.status(st.query_params.get('job')) is not None:
+        st.session_state.training_job = st.query_params['job']
     
     # Model Configuration Panel
     st.markdown("### ⚙️ Model Configuration")
@@ -740,10 +3931,8 @@ def model_engine_page():
     
     with col3:
         # Determine available models based on problem type
-        if st.session_state.get('is_regression', False):
-            available_models = ["Random Forest Regressor", "Linear Regression", "Ridge", "Lasso", "Gradient Boosting Regressor", "SVR"]
-        else:
-            available_models = ["Random Forest", "Logistic Regression", "Gradient Boosting"]
+        is_regression = is_regression_target(df, fingerprint, target_column)
+        available_models = REGRESSION_MODELS if is_regression else CLASSIFICATION_MODELS
         
         model_type = st.selectbox(
             "🤖 Model Algorithm",
@@ -770,83 +3959,105 @@ def model_engine_page():
     # Train button
     st.markdown("---")
     
-    if st.button("🚀 TRAIN MODEL", use_container_width=True):
-        try:
-            with st.spinner("🔄 Training model... Please wait"):
-                # Prepare data
-                X = df[selected_features].copy()
-                y = df[target_column].copy()
-                
-                # Handle categorical variables
-                label_encoders = {}
-                for col in X.select_dtypes(include=['object', 'category']).columns:
-                    le = LabelEncoder()
-                    X[col] = le.fit_transform(X[col].astype(str))
-                    label_encoders[col] = le
-                
-                # Encode target if categorical
-                if y.dtype == 'object' or y.dtype == 'category':
-                    target_encoder = LabelEncoder()
-                    y = target_encoder.fit_transform(y.astype(str))
-                    label_encoders['target'] = target_encoder
-                
-                # Determine problem type
-                unique_targets = len(np.unique(y))
-                is_regression = unique_targets > 10 or (y.dtype in ['float64', 'float32'] and unique_targets > 5)
-                st.session_state.is_regression = is_regression
-                st.session_state.problem_type = "Regression" if is_regression else "Classification"
-                
-                if is_regression:
-                    st.info(f"📊 Detected **Regression** problem ({unique_targets} unique values)")
-                else:
-                    st.info(f"🎯 Detected **Classification** problem ({unique_targets} classes)")
-                
-                # Train-test split
-                X_train, X_test, y_train, y_test = train_test_split(
-                    X, y, test_size=test_size/100, random_state=42
+    training_mode = st.radio(
+        "🏁 Training Mode",
+        ["🎯 Single Model", "🏁 Train All (Leaderboard)", "🎛️ Tune Hyperparameters"],
+        horizontal=True,
+        help="Train All races every algorithm on the same split, stopping clear losers early; "
+             "Tune searches the selected algorithm's hyperparameters within a time budget"
+    )
+    
+    if training_mode == "🎛️ Tune Hyperparameters":
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            time_budget = st.slider("⏱️ Time Budget (s)", 30, 1800, TUNING_BUDGET_SECONDS, 30)
+        with col2:
+            n_candidates = st.slider("🎲 Candidates", 9, 81, TUNING_CANDIDATES, 9)
+        with col3:
+            n_splits = st.selectbox("🔁 CV Folds", [3, 5], index=0)
+        
+        if st.button("🎛️ START TUNING", use_container_width=True):
+            if st.session_state.training_job is not None:
+                runner.cancel(st.session_state.training_job)
+                runner.forget(st.session_state.training_job)
+            job_id = runner.submit(
+                run_tuning_job, f"{model_type} (tuning)",
+                df, selected_features, target_column, model_type, is_regression, test_size,
+                st.session_state.core_budget, fingerprint, n_candidates, n_splits, time_budget
+            )
+            st.session_state.training_job = job_id
+            st.session_state.training_job_frame = df
+            st.query_params['job'] = job_id
+        
+        if st.session_state.training_job is None and st.session_state.tuning_results is not None:
+            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+            render_tuning_results(st.session_state.tuning_results,
+                                  "R² Score" if st.session_state.is_regression else "Accuracy")
+            st.markdown('</div>', unsafe_allow_html=True)
+    elif training_mode == "🎯 Single Model":
+        col1, col2 = st.columns(2)
+        with col1:
+            evaluation = st.radio(
+                "🧪 Evaluation",
+                ["Holdout Split", "K-Fold Cross-Validation"],
+                horizontal=True,
+                help="Cross-validation scores every row out-of-fold and reports mean ± std across folds, "
+                     "then fits the final model on all rows"
+            )
+        with col2:
+            n_splits = st.selectbox("🔁 CV Folds", CV_FOLD_OPTIONS, index=1,
+                                    disabled=evaluation == "Holdout Split")
+        
+        if st.button("🚀 TRAIN MODEL", use_container_width=True):
+            # Fitting runs in the shared worker pool; this session only polls the job
+            if st.session_state.training_job is not None:
+                runner.cancel(st.session_state.training_job)
+                runner.forget(st.session_state.training_job)
+            if evaluation == "Holdout Split":
+                job_id = runner.submit(
+                    run_training_job, model_type,
+                    df, selected_features, target_column, model_type, is_regression, test_size,
+                    st.session_state.core_budget, None, True, fingerprint
                 )
-                
-                # Train model based on problem type
-                if st.session_state.is_regression:
-                    # Regression models
-                    if model_type == "Random Forest Regressor":
-                        model = RandomForestRegressor(n_estimators=100, random_state=42)
-                    elif model_type == "Linear Regression":
-                        model = LinearRegression()
-                    elif model_type == "Ridge":
-                        model = Ridge(alpha=1.0, random_state=42)
-                    elif model_type == "Lasso":
-                        model = Lasso(alpha=1.0, random_state=42)
-                    elif model_type == "Gradient Boosting Regressor":
-                        model = GradientBoostingRegressor(n_estimators=100, random_state=42)
-                    else:  # SVR
-                        model = SVR(kernel='rbf')
-                else:
-                    # Classification models
-                    if model_type == "Random Forest":
-                        model = RandomForestClassifier(n_estimators=100, random_state=42)
-                    elif model_type == "Logistic Regression":
-                        model = LogisticRegression(max_iter=1000, random_state=42)
-                    else:  # Gradient Boosting
-                        model = GradientBoostingClassifier(n_estimators=100, random_state=42)
-                
-                model.fit(X_train, y_train)
-                
-                # Store in session state
-                st.session_state.model = model
-                st.session_state.X_train = X_train
-                st.session_state.X_test = X_test
-                st.session_state.y_train = y_train
-                st.session_state.y_test = y_test
-                st.session_state.feature_names = selected_features
-                st.session_state.target_name = target_column
-                st.session_state.label_encoders = label_encoders
-                
-                st.success("✅ Model trained successfully!")
+            else:
+                job_id = runner.submit(
+                    run_cv_job, f"{model_type} ({n_splits}-fold CV)",
+                    df, selected_features, target_column, model_type, is_regression, n_splits,
+                    st.session_state.core_budget, fingerprint
+                )
+            st.session_state.training_job = job_id
+            st.session_state.training_job_frame = df
+            st.query_params['job'] = job_id
+    else:
+        if st.button("🏁 TRAIN ALL MODELS", use_container_width=True):
+            if st.session_state.race is not None:
+                stop_race(runner, st.session_state.race)
+            st.session_state.race = start_race(
+                runner, available_models,
+                df, selected_features, target_column, is_regression, test_size,
+                st.session_state.core_budget, fingerprint
+            )
         
-        except Exception as e:
-            st.error(f"❌ Error training model: {str(e)}")
-            return
+        if st.session_state.race is not None:
+            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+            if st.session_state.race['finished']:
+                race_results_panel()
+            else:
+                race_progress_panel()
+            st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Outside the mode branches, so switching modes mid-job neither hides it nor drops its result
+    if st.session_state.training_job is not None:
+        training_job_panel()
+    
+    notice = st.session_state.pop('training_notice', None)
+    if notice is not None:
+        if notice.startswith("✅"):
+            st.success(notice)
+        elif notice.startswith("❌"):
+            st.error(notice)
+        else:
+            st.warning(notice)
     
     # Model Evaluation (show only if model is trained)
     if st.session_state.model is not None:
@@ -854,8 +4065,7 @@ def model_engine_page():
         st.markdown("### 📊 Model Performance")
         
         model = st.session_state.model
-        X_test = st.session_state.X_test
-        y_test = st.session_state.y_test
+        cv = st.session_state.cv_results
         
         # Threshold slider
         threshold = st.slider(
@@ -867,41 +4077,37 @@ def model_engine_page():
             help="Adjust classification threshold"
         )
         
-        # Predictions and Metrics
+        # Predictions, probabilities and curves are computed once per trained model; reruns only
+        # re-render them, and each threshold's metrics are computed once
+        bundle = st.session_state.evaluation
+        if bundle is None or bundle['model'] is not model:
+            with st.spinner("Evaluating model..."):
+                bundle = st.session_state.evaluation = compute_evaluation(
+                    model, st.session_state.is_regression, st.session_state.X_test, st.session_state.y_test,
+                    cv, st.session_state.feature_names
+                )
+        if cv is not None:
+            st.caption(f"🔁 {cv['n_splits']}-fold cross-validation: metrics are mean ± std across folds, "
+                       f"plots use the out-of-fold predictions of every row")
+        evaluation = evaluation_at_threshold(bundle, threshold)
+        metrics, values = evaluation['metrics'], evaluation['values']
+        y_eval, y_pred = bundle['y_true'], bundle['y_pred']
+        
+        st.markdown('<div class="custom-card">', unsafe_allow_html=True)
+        for column, (name, value) in zip(st.columns(4), values.items()):
+            with column:
+                st.metric(name, value)
+        st.markdown('</div>', unsafe_allow_html=True)
+        
         if st.session_state.is_regression:
-            # Regression predictions
-            y_pred = model.predict(X_test)
-            
-            # Regression Metrics
-            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                mae = mean_absolute_error(y_test, y_pred)
-                st.metric("📊 MAE", f"{mae:.3f}")
-            
-            with col2:
-                mse = mean_squared_error(y_test, y_pred)
-                st.metric("📊 MSE", f"{mse:.3f}")
-            
-            with col3:
-                rmse = np.sqrt(mse)
-                st.metric("📊 RMSE", f"{rmse:.3f}")
-            
-            with col4:
-                r2 = r2_score(y_test, y_pred)
-                st.metric("📊 R² Score", f"{r2:.3f}")
-            
-            st.markdown('</div>', unsafe_allow_html=True)
-            
             # Prediction vs Actual plot
             st.markdown("---")
             st.markdown("### 📈 Prediction vs Actual")
             
             fig = go.Figure()
-            fig.add_trace(go.Scatter(x=y_test, y=y_pred, mode='markers', name='Predictions', 
+            fig.add_trace(go.Scatter(x=y_eval, y=y_pred, mode='markers', name='Predictions', 
                                      marker=dict(color='#8B5CF6', size=8)))
-            fig.add_trace(go.Scatter(x=[y_test.min(), y_test.max()], y=[y_test.min(), y_test.max()],
+            fig.add_trace(go.Scatter(x=[y_eval.min(), y_eval.max()], y=[y_eval.min(), y_eval.max()],
                                      mode='lines', name='Perfect Prediction', 
                                      line=dict(color='#00C9FF', dash='dash')))
             
@@ -911,49 +4117,19 @@ def model_engine_page():
             
             # Residual plot
             st.markdown("### 📊 Residual Analysis")
-            residuals = y_test - y_pred
+            residuals = y_eval - y_pred
             fig = px.scatter(x=y_pred, y=residuals, template="plotly_dark",
                            labels={'x': 'Predicted', 'y': 'Residuals'})
             fig.add_hline(y=0, line_dash="dash", line_color="#00C9FF")
             fig.update_layout(plot_bgcolor='#0E1117', paper_bgcolor='#0E1117', font=dict(color='#FAFAFA'))
             st.plotly_chart(fig, use_container_width=True)
-            
-        else:
-            # Classification predictions
-            if len(np.unique(y_test)) == 2:
-                y_pred_proba = model.predict_proba(X_test)[:, 1]
-                y_pred = (y_pred_proba >= threshold).astype(int)
-            else:
-                y_pred = model.predict(X_test)
-            
-            # Classification Metrics
-            st.markdown('<div class="custom-card">', unsafe_allow_html=True)
-            col1, col2, col3, col4 = st.columns(4)
-            
-            with col1:
-                acc = accuracy_score(y_test, y_pred)
-                st.metric("🎯 Accuracy", f"{acc:.3f}")
-            
-            with col2:
-                prec = precision_score(y_test, y_pred, average='weighted', zero_division=0)
-                st.metric("🎯 Precision", f"{prec:.3f}")
-            
-            with col3:
-                rec = recall_score(y_test, y_pred, average='weighted', zero_division=0)
-                st.metric("🎯 Recall", f"{rec:.3f}")
-            
-            with col4:
-                f1 = f1_score(y_test, y_pred, average='weighted', zero_division=0)
-                st.metric("🎯 F1-Score", f"{f1:.3f}")
-            
-            st.markdown('</div>', unsafe_allow_html=True)
         
         # Confusion Matrix (Classification only)
         if not st.session_state.is_regression:
             st.markdown("---")
             st.markdown("### 🔥 Confusion Matrix")
             
-            cm = confusion_matrix(y_test, y_pred)
+            cm = evaluation['confusion']
         
             fig = go.Figure(data=go.Heatmap(
                 z=cm,
@@ -979,16 +4155,14 @@ def model_engine_page():
             st.plotly_chart(fig, use_container_width=True)
         
             # ROC Curve (for binary classification)
-            if len(np.unique(y_test)) == 2:
+            if bundle['y_score'] is not None:
                 st.markdown("---")
 
                 st.markdown("### 📈 ROC Curve")
 
             
-                try:
-                    y_pred_proba = model.predict_proba(X_test)[:, 1]
-                    fpr, tpr, thresholds = roc_curve(y_test, y_pred_proba)
-                    auc_score = roc_auc_score(y_test, y_pred_proba)
+                if bundle['roc'] is not None:
+                    fpr, tpr, auc_score = bundle['roc']
                     
                     fig = go.Figure()
                     
@@ -1020,21 +4194,16 @@ def model_engine_page():
                     
                     st.plotly_chart(fig, use_container_width=True)
                     
-                except Exception as e:
-                    st.warning(f"Could not generate ROC curve: {str(e)}")
+                else:
+                    st.warning(f"Could not generate ROC curve: {bundle['roc_error']}")
         
         # Feature Importance (for tree-based models)
-        if hasattr(model, 'feature_importances_'):
+        if bundle['importance'] is not None:
             st.markdown("---")
             st.markdown("### 🌟 Feature Importance")
             
-            importance_df = pd.DataFrame({
-                'Feature': st.session_state.feature_names,
-                'Importance': model.feature_importances_
-            }).sort_values('Importance', ascending=False)
-            
             fig = px.bar(
-                importance_df,
+                bundle['importance'],
                 x='Importance',
                 y='Feature',
                 orientation='h',
@@ -1050,6 +4219,151 @@ def model_engine_page():
             )
             
             st.plotly_chart(fig, use_container_width=True)
+        
+        # Model Registry
+        st.markdown("---")
+        st.markdown("### 💾 Save to Model Registry")
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            registry_name = st.text_input(
+                "Model name",
+                value=f"{st.session_state.target_name}-{type(model).__name__}",
+                label_visibility="collapsed",
+                help="Saving under an existing name registers a new version"
+            )
+        with col2:
+            save_clicked = st.button("💾 SAVE MODEL", use_container_width=True)
+        if save_clicked:
+            feature_names = st.session_state.feature_names
+            try:
+                manifest = get_model_registry().save(registry_name, model, st.session_state.encoder, {
+                    'model_type': type(model).__name__,
+                    'problem_type': st.session_state.problem_type,
+                    'is_regression': st.session_state.is_regression,
+                    'feature_names': list(feature_names),
+                    'target_name': st.session_state.target_name,
+                    'feature_schema': get_feature_schema(df, fingerprint, feature_names),
+                    'metrics': {name: float(value) for name, value in metrics.items()},
+                    'evaluation': "holdout" if cv is None else f"{cv['n_splits']}-fold CV",
+                    'dataset_fingerprint': st.session_state.model_fingerprint,
+                })
+                st.success(f"✅ Registered **{manifest['name']}** v{manifest['version']} - "
+                           f"it can now be picked in the Prediction Simulator, or served over HTTP with "
+                           f"`python serve.py --model {manifest['name']}`.")
+            except Exception as e:
+                st.error(f"❌ Could not register model: {str(e)}")
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📈 SENSITIVITY ANALYSIS
+# ═══════════════════════════════════════════════════════════════════════════
+
+SWEEP_CURVE_POINTS = 50
+SWEEP_SURFACE_POINTS = 25
+# Dataset rows drawn as individual conditional expectation (ICE) curves
+SWEEP_ICE_ROWS = 50
+
+
+def sensitivity_sweep(model, encoder, feature_names, base_rows, features, grids):
+    """Model output with ``features`` moved over ``grids`` for every base row, from one batched call.
+    
+    Returns an array shaped ``(base rows, *grid sizes, outputs)``: class
+    probabilities for classifiers, the prediction for regressors.
+    """
+    mesh = np.meshgrid(*grids, indexing='ij')
+    points = np.column_stack([axis.ravel() for axis in mesh])
+    base = encoder.transform(base_rows[feature_names]).to_numpy(dtype=np.float64, na_value=np.nan)
+    X = np.repeat(base, len(points), axis=0)
+    for j, feature in enumerate(features):
+        X[:, feature_names.index(feature)] = np.tile(points[:, j], len(base))
+    output = model.predict_proba(X) if hasattr(model, 'predict_proba') else model.predict(X)[:, None]
+    return output.reshape(len(base), *(len(grid) for grid in grids), -1)
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def _cached_sweep(model_token, base_key, ice_key, features, grids, _model, _encoder, _feature_names, _base_rows):
+    return sensitivity_sweep(_model, _encoder, _feature_names, _base_rows, list(features),
+                             [np.asarray(grid) for grid in grids])
+
+
+def get_sensitivity_sweep(model, encoder, feature_names, model_token, base_point, ice_rows, ice_key, features,
+                          grids):
+    """Sweep around ``base_point`` (first row of the result) plus any ICE rows, cached per model and base point"""
+    base_rows = pd.concat([pd.DataFrame([base_point]), ice_rows], ignore_index=True) if ice_rows is not None \
+        else pd.DataFrame([base_point])
+    if model_token is None:
+        return sensitivity_sweep(model, encoder, feature_names, base_rows, features, grids)
+    base_key = tuple((feature, _to_builtin(value)) for feature, value in base_point.items())
+    return _cached_sweep(model_token, base_key, ice_key, tuple(features), tuple(tuple(grid) for grid in grids),
+                         model, encoder, feature_names, base_rows)
+
+
+def sensitivity_sweep_view(model, encoder, feature_names, schema, base_point, model_token, ice_source=None):
+    """Response curve (one feature) or surface (two features) around the simulator's inputs"""
+    numeric = [feature for feature in feature_names if schema[feature]['kind'] == 'numeric']
+    if not numeric:
+        st.info("ℹ️ The model has no numeric features to sweep.")
+        return
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        features = st.multiselect("📈 Features to sweep (one or two)", numeric, default=numeric[:1],
+                                  max_selections=2)
+    with col2:
+        points = st.slider(
+            "🔢 Grid Points",
+            10,
+            200 if len(features) < 2 else 50,
+            SWEEP_CURVE_POINTS if len(features) < 2 else SWEEP_SURFACE_POINTS,
+            help="Grid points per swept feature, spanning its observed range"
+        )
+    if not features:
+        return
+    
+    if hasattr(model, 'predict_proba'):
+        classes = list(encoder.decode_target(model.classes_))
+        output_label = st.selectbox("🎯 Class probability to plot", classes, index=len(classes) - 1)
+        output = classes.index(output_label)
+        output_label = f"P({output_label})"
+    else:
+        output, output_label = 0, "Prediction"
+    
+    grids = [np.linspace(schema[feature]['min'], schema[feature]['max'], points) for feature in features]
+    ice_rows = ice_key = None
+    if ice_source is not None and len(features) == 1:
+        df, fingerprint = ice_source
+        ice_rows = df[feature_names].sample(min(SWEEP_ICE_ROWS, len(df)), random_state=42)
+        ice_key = fingerprint
+    with st.spinner("Scoring the grid..."):
+        response = get_sensitivity_sweep(model, encoder, feature_names, model_token, base_point, ice_rows, ice_key,
+                                         features, grids)[..., output]
+    
+    fig = go.Figure()
+    if len(features) == 1:
+        x = grids[0]
+        if ice_rows is not None:
+            for curve in response[1:]:
+                fig.add_trace(go.Scatter(x=x, y=curve, mode='lines', showlegend=False, hoverinfo='skip',
+                                         line=dict(color='rgba(139, 92, 246, 0.25)', width=1)))
+            fig.add_trace(go.Scatter(x=x, y=response[1:].mean(axis=0), mode='lines',
+                                     name='Partial dependence (mean of ICE rows)',
+                                     line=dict(color='#8B5CF6', width=3, dash='dash')))
+        fig.add_trace(go.Scatter(x=x, y=response[0], mode='lines', name='Current inputs',
+                                 line=dict(color='#00C9FF', width=3)))
+        fig.add_vline(x=base_point[features[0]], line_dash="dot", line_color="#FAFAFA")
+        fig.update_layout(xaxis_title=features[0], yaxis_title=output_label)
+    else:
+        fig.add_trace(go.Heatmap(x=grids[0], y=grids[1], z=response[0].T, colorscale='Purples',
+                                 colorbar=dict(title=output_label)))
+        fig.add_trace(go.Scatter(x=[base_point[features[0]]], y=[base_point[features[1]]], mode='markers',
+                                 name='Current inputs', marker=dict(color='#00C9FF', size=12, symbol='x')))
+        fig.update_layout(xaxis_title=features[0], yaxis_title=features[1])
+    fig.update_layout(template="plotly_dark", plot_bgcolor='#0E1117', paper_bgcolor='#0E1117',
+                      font=dict(color='#FAFAFA'), title=f"{output_label} sensitivity")
+    st.plotly_chart(fig, use_container_width=True)
+    n_rows = response.size
+    st.caption(f"{n_rows:,} grid predictions from one batched model call; "
+               f"other features held at the inputs above")
+
 
 # ═══════════════════════════════════════════════════════════════════════════
 # 🔮 PREDICTION SIMULATOR MODULE
@@ -1060,17 +4374,55 @@ def prediction_simulator_page():
     st.markdown('<h1 class="glow-text">🔮 Prediction Simulator</h1>', unsafe_allow_html=True)
     st.markdown("---")
     
-    if st.session_state.model is None:
+    # The session's trained model, or any version from the model registry
+    registered = {f"{manifest['name']} v{manifest['version']}": manifest
+                  for manifest in get_model_registry().manifests()}
+    options = (["🧠 Current session model"] if st.session_state.model is not None else []) + list(registered)
+    if not options:
         st.warning("⚠️ Please train a model first in the Model Engine section!")
         return
     
+    choice = st.selectbox(
+        "📦 Model",
+        options,
+        format_func=lambda option: option if option not in registered else (
+            f"🗃️ {option} · {registered[option]['model_type']} · {registered[option]['created']}"
+        ),
+        help="Models saved to the registry can be used without retraining"
+    )
+    if choice in registered:
+        manifest = registered[choice]
+        try:
+            model, encoder, manifest = load_registered_model(manifest['name'], manifest['version'])
+        except Exception as e:
+            st.error(f"❌ Could not load {choice}: {str(e)}")
+            return
+        feature_names = manifest['feature_names']
+        schema = manifest['feature_schema']
+        model_token = choice
+        # ICE curves need the rows the model was trained on
+        df, fingerprint = active_dataset()
+        ice_source = (df, fingerprint) if fingerprint is not None and fingerprint == manifest['dataset_fingerprint'] \
+            else None
+        st.caption("📊 " + " · ".join(f"{name} {value:.3f}" for name, value in manifest['metrics'].items())
+                   + f" ({manifest['evaluation']})")
+    else:
+        model = st.session_state.model
+        encoder = st.session_state.encoder
+        feature_names = st.session_state.feature_names
+        df, fingerprint = active_dataset()
+        schema = get_feature_schema(df, fingerprint, feature_names)
+        model_token = st.session_state.model_token
+        ice_source = (df, fingerprint) if fingerprint is not None else None
+    
+    mode = st.radio("🧭 Mode", ["🎯 Single Prediction", "📈 Sensitivity Sweep", "📦 Batch Scoring"], horizontal=True)
+    if mode == "📦 Batch Scoring":
+        batch_scoring_view(model, encoder, feature_names)
+        return
+    
     st.markdown("### 🎯 Input Feature Values")
     st.markdown('<div class="custom-card">', unsafe_allow_html=True)
     
-    # Get original dataframe for reference
-    df = st.session_state.cleaned_df if st.session_state.cleaned_df is not None else st.session_state.df
-    feature_names = st.session_state.feature_names
-    
     # Create input fields dynamically
     input_data = {}
     
@@ -1085,11 +4437,11 @@ def prediction_simulator_page():
                 
                 with col:
                     # Check if feature is numeric or categorical
-                    if df[feature].dtype in ['int64', 'float64']:
+                    if schema[feature]['kind'] == 'numeric':
                         # Numeric input
-                        min_val = float(df[feature].min())
-                        max_val = float(df[feature].max())
-                        mean_val = float(df[feature].mean())
+                        min_val = schema[feature]['min']
+                        max_val = schema[feature]['max']
+                        mean_val = schema[feature]['mean']
                         
                         input_data[feature] = st.number_input(
                             f"🔢 {feature}",
@@ -1100,7 +4452,7 @@ def prediction_simulator_page():
                         )
                     else:
                         # Categorical input
-                        unique_values = df[feature].unique().tolist()
+                        unique_values = schema[feature]['values']
                         input_data[feature] = st.selectbox(
                             f"🏷️ {feature}",
                             unique_values,
@@ -1109,6 +4461,12 @@ def prediction_simulator_page():
     
     st.markdown('</div>', unsafe_allow_html=True)
     
+    if mode == "📈 Sensitivity Sweep":
+        st.markdown("---")
+        st.markdown("### 📈 What-If Sensitivity")
+        sensitivity_sweep_view(model, encoder, feature_names, schema, input_data, model_token, ice_source)
+        return
+    
     # Predict button
     st.markdown("---")
     
@@ -1117,31 +4475,22 @@ def prediction_simulator_page():
             # Prepare input
             input_df = pd.DataFrame([input_data])
             
-            # Encode categorical features
-            label_encoders = st.session_state.label_encoders
-            for col in input_df.columns:
-                if col in label_encoders and col != 'target':
-                    le = label_encoders[col]
-                    try:
-                        input_df[col] = le.transform(input_df[col].astype(str))
-                    except:
-                        # Handle unseen categories
-                        input_df[col] = 0
+            # Encode categorical features (same path as batch scoring)
+            input_df = encoder.transform(input_df)
             
             # Make prediction
-            model = st.session_state.model
             prediction = model.predict(input_df)[0]
             
             # Get probability if available
             if hasattr(model, 'predict_proba'):
                 proba = model.predict_proba(input_df)[0]
-                max_proba = proba[prediction]
+                max_proba = proba.max()
             else:
                 max_proba = None
             
             # Decode prediction if target was encoded
-            if 'target' in label_encoders:
-                prediction_label = label_encoders['target'].inverse_transform([prediction])[0]
+            if encoder.classes_ is not None:
+                prediction_label = encoder.decode_target([prediction])[0]
             else:
                 prediction_label = prediction
             
@@ -1166,8 +4515,8 @@ def prediction_simulator_page():
                 st.markdown("#### 📊 Probability Distribution")
                 
                 # Create bar chart of probabilities
-                if 'target' in label_encoders:
-                    classes = label_encoders['target'].classes_
+                if encoder.classes_ is not None:
+                    classes = encoder.decode_target(model.classes_)
                 else:
                     classes = [f"Class {i}" for i in range(len(proba))]
                 
@@ -1258,9 +4607,18 @@ def main():
         """, unsafe_allow_html=True)
         
         if st.session_state.df is not None:
-            df = st.session_state.cleaned_df if st.session_state.cleaned_df is not None else st.session_state.df
-            st.metric("Dataset Rows", f"{len(df):,}")
-            st.metric("Dataset Columns", len(df.columns))
+            df, fingerprint = active_dataset()
+            profile = get_dataset_profile(df, fingerprint)
+            st.metric("Dataset Rows", f"{profile['n_rows']:,}")
+            st.metric("Dataset Columns", profile['n_cols'])
+            memory = session_memory_report()
+            st.metric(
+                "🧮 Session Memory",
+                f"{memory['resident'] / 1024 ** 2:.2f} MB",
+                delta=f"{(memory['logical'] - memory['resident']) / 1024 ** 2:.2f} MB shared",
+                delta_color="off",
+                help=f"{memory['objects']} data objects · {memory['logical'] / 1024 ** 2:.2f} MB if every copy were materialized"
+            )
             if st.session_state.model is not None:
                 st.success("✅ Model Trained")
             else:
@@ -1268,6 +4626,18 @@ def main():
         else:
             st.info("No dataset loaded")
         
+        st.markdown("---")
+        if CPU_CORES > 1:
+            st.slider(
+                "🧵 CPU Cores per Training Job",
+                min_value=1,
+                max_value=CPU_CORES,
+                key='core_budget',
+                help=f"{CPU_CORES} cores shared by up to {TRAINING_WORKERS} concurrent training jobs"
+            )
+        else:
+            st.caption("🧵 Training on the single available CPU core")
+        
         st.markdown("---")
         st.markdown("""
         <div style='text-align: center; font-size: 0.8rem; color: #8B5CF6;'>
@@ -0,0 +1,398 @@
+"""
+⚡ NovaCore Prediction Server
+Serves a model from the NovaCore model registry over local HTTP
+
+    python serve.py --list
+    python serve.py --model <name> [--version N] [--port 8765]
+
+Endpoints:
+    POST /predict   JSON ``{"rows": [{feature: value, ...}, ...]}`` or a single
+                    ``{feature: value, ...}`` object; an Arrow IPC stream body
+                    (Content-Type: application/vnd.apache.arrow.stream) is
+                    answered with an Arrow stream of predictions
+    GET  /metrics   request counts, p50/p99 latency and batch sizes
+    GET  /health    the served model and its feature schema
+"""
+
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+from threadpoolctl import threadpool_limits
+
+# Registered artifacts pickle their encoder as app.CategoricalEncoder
+import app
+
+DEFAULT_PORT = 8765
+# Concurrent single-row requests are scored together, up to this many rows per model call
+MAX_BATCH_ROWS = 64
+# How long an open batch waits for more rows; 0 only batches rows that queued up meanwhile
+MAX_WAIT_MS = 0.0
+# Batches up to this size skip sklearn's forest predict for a direct walk over the fitted trees
+TREE_WALK_MAX_ROWS = 256
+LATENCY_WINDOW = 10_000
+ARROW_STREAM = 'application/vnd.apache.arrow.stream'
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🧩 COMPILED MODEL
+# ═══════════════════════════════════════════════════════════════════════════
+
+class CompiledModel:
+    """A registered model with its encoder flattened into plain-Python lookups.
+    
+    Single rows are encoded straight into a float64 vector - a dict lookup per
+    categorical feature, ``float()`` per numeric one - without building a
+    DataFrame. Larger batches go through the shared ``CategoricalEncoder``.
+    """
+
+    def __init__(self, model, encoder, manifest):
+        self.model = model
+        self.encoder = encoder
+        self.manifest = manifest
+        self.feature_names = manifest['feature_names']
+        self.lookups = []
+        for feature in self.feature_names:
+            vocabulary = encoder.vocabularies.get(feature)
+            if vocabulary is None:
+                self.lookups.append(None)
+            else:
+                codes = {value: code for code, value in enumerate(vocabulary)}
+                self.lookups.append((codes, len(vocabulary), vocabulary.inferred_type == 'string'))
+        if 'n_jobs' in model.get_params():
+            # Requests run on their own threads; per-call tree threads would only add overhead
+            model.set_params(n_jobs=1)
+        self.has_proba = hasattr(model, 'predict_proba')
+        self.classes = encoder.decode_target(model.classes_).tolist() if self.has_proba else None
+        # Forest predict spends milliseconds per call dispatching its trees through joblib and
+        # re-validating input; small batches sum the fitted trees directly instead
+        self.trees = None
+        if isinstance(model, (app.RandomForestClassifier, app.RandomForestRegressor)):
+            self.trees = [estimator.tree_ for estimator in model.estimators_]
+            example = self.encode_row(self.example_row())[None, :]
+            reference = model.predict_proba(example) if self.has_proba else model.predict(example)
+            if not np.allclose(self._walk_trees(example), reference):
+                self.trees = None
+
+    def encode_row(self, row):
+        """Float64 feature vector of one ``{feature: value}`` row, using the encoder's buckets"""
+        vector = np.empty(len(self.feature_names))
+        for i, (feature, lookup) in enumerate(zip(self.feature_names, self.lookups)):
+            if feature not in row:
+                raise ValueError(f"missing feature {feature!r}")
+            value = row[feature]
+            if lookup is None:
+                vector[i] = np.nan if value is None else float(value)
+                continue
+            codes, k, textual = lookup
+            if value is None or value != value:
+                vector[i] = k
+            else:
+                code = codes.get(value)
+                if code is None and textual and not isinstance(value, str):
+                    code = codes.get(str(value))
+                vector[i] = k + 1 if code is None else code
+        return vector
+
+    def _walk_trees(self, X):
+        """Forest output for a float matrix: averaged class fractions, or averaged tree predictions"""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        total = 0
+        for tree in self.trees:
+            out = tree.predict(X)
+            if self.has_proba:
+                out = out[:, :self.model.n_classes_]
+                normalizer = out.sum(axis=1, keepdims=True)
+                out = out / np.where(normalizer == 0, 1, normalizer)
+            total = total + out
+        total = total / len(self.trees)
+        return total if self.has_proba else total.reshape(len(X))
+
+    def predict(self, X):
+        """(predictions, probabilities or None) for an encoded matrix or frame"""
+        fast = self.trees is not None and isinstance(X, np.ndarray) and len(X) <= TREE_WALK_MAX_ROWS
+        if not self.has_proba:
+            return (self._walk_trees(X) if fast else self.model.predict(X)), None
+        # Classifiers predict the most probable class, so one predict_proba call yields both
+        proba = self._walk_trees(X) if fast else self.model.predict_proba(X)
+        codes = self.model.classes_.take(proba.argmax(axis=1))
+        return self.encoder.decode_target(codes), proba
+
+    def predict_frame(self, frame):
+        missing = [feature for feature in self.feature_names if feature not in frame.columns]
+        if missing:
+            raise ValueError(f"missing feature(s): {', '.join(map(str, missing))}")
+        return self.predict(self.encoder.transform(frame[self.feature_names]))
+
+    def example_row(self):
+        """A typical input row from the feature schema, used to warm the model up"""
+        schema = self.manifest['feature_schema']
+        return {
+            feature: spec['mean'] if spec['kind'] == 'numeric' else (spec['values'] or [None])[0]
+            for feature, spec in schema.items()
+        }
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📈 LATENCY METRICS
+# ═══════════════════════════════════════════════════════════════════════════
+
+class LatencyStats:
+    """Rolling window of request latencies and batch sizes, published on ``/metrics``"""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self._latencies = deque(maxlen=window)
+        self._batches = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rows = 0
+        self.errors = 0
+        self.started = time.time()
+
+    def record(self, seconds, rows):
+        with self._lock:
+            self._latencies.append(seconds)
+            self.requests += 1
+            self.rows += rows
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_batch(self, rows):
+        with self._lock:
+            self._batches.append(rows)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            batches = np.array(self._batches)
+            counts = {'requests': self.requests, 'rows': self.rows, 'errors': self.errors}
+        p50, p99 = np.percentile(latencies, [50, 99]) if len(latencies) else (None, None)
+        return {
+            **counts,
+            'uptime_s': round(time.time() - self.started, 1),
+            'window': len(latencies),
+            'p50_ms': None if p50 is None else round(float(p50), 3),
+            'p99_ms': None if p99 is None else round(float(p99), 3),
+            'max_ms': round(float(latencies.max()), 3) if len(latencies) else None,
+            'micro_batches': len(batches),
+            'mean_batch_rows': round(float(batches.mean()), 2) if len(batches) else None,
+        }
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 📦 MICRO-BATCHING
+# ═══════════════════════════════════════════════════════════════════════════
+
+class MicroBatcher:
+    """Coalesces concurrent single-row requests into one model call.
+    
+    A single thread owns the model. It takes the first queued row, gathers
+    whatever else arrives within ``max_wait`` seconds (and everything that
+    queued up while the previous batch was being scored), up to ``max_rows``,
+    and answers every request from one ``predict_proba`` call.
+    """
+
+    def __init__(self, compiled, stats, max_rows=MAX_BATCH_ROWS, max_wait=MAX_WAIT_MS / 1000):
+        self.compiled = compiled
+        self.stats = stats
+        self.max_rows = max_rows
+        self.max_wait = max_wait
+        self._queue = queue.SimpleQueue()
+        threading.Thread(target=self._run, name="micro-batcher", daemon=True).start()
+
+    def submit(self, vector):
+        future = Future()
+        self._queue.put((vector, future))
+        return future
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_rows:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                predictions, proba = self.compiled.predict(np.vstack([vector for vector, _ in batch]))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.stats.record_batch(len(batch))
+            for i, (_, future) in enumerate(batch):
+                future.set_result((predictions[i:i + 1], None if proba is None else proba[i:i + 1]))
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🌐 HTTP SERVER
+# ═══════════════════════════════════════════════════════════════════════════
+
+def _json_default(value):
+    return value.item() if isinstance(value, np.generic) else str(value)
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    server_version = "NovaCorePredict/1.0"
+    # Keep-alive connections save a TCP handshake per request; without Nagle the
+    # response isn't held back waiting for the client's delayed ACK
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        # Per-request access logging to stderr costs more than scoring a row
+        pass
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload, default=_json_default).encode(), 'application/json')
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send_json(200, self.server.stats.snapshot())
+        elif self.path == '/health':
+            manifest = self.server.compiled.manifest
+            self._send_json(200, {
+                'status': 'ok',
+                **{key: manifest[key] for key in ('name', 'version', 'model_type', 'problem_type',
+                                                  'target_name', 'feature_names', 'feature_schema')},
+            })
+        else:
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+
+    def do_POST(self):
+        started = time.perf_counter()
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        if self.path != '/predict':
+            self._send_json(404, {'error': f"unknown path {self.path}"})
+            return
+        try:
+            if self.headers.get('Content-Type', '').startswith(ARROW_STREAM):
+                rows = self._predict_arrow(body)
+            else:
+                rows = self._predict_json(body)
+        except (KeyError, ValueError, TypeError) as e:
+            self.server.stats.record_error()
+            self._send_json(400, {'error': str(e)})
+            return
+        except Exception as e:
+            self.server.stats.record_error()
+            self._send_json(500, {'error': str(e)})
+            return
+        self.server.stats.record(time.perf_counter() - started, rows)
+
+    def _predict_json(self, body):
+        payload = json.loads(body)
+        rows = payload['rows'] if isinstance(payload, dict) and 'rows' in payload else payload
+        if isinstance(rows, dict):
+            rows = [rows]
+        compiled = self.server.compiled
+        if len(rows) == 1:
+            predictions, proba = self.server.batcher.submit(compiled.encode_row(rows[0])).result()
+        elif len(rows) <= self.server.batcher.max_rows:
+            predictions, proba = compiled.predict(np.vstack([compiled.encode_row(row) for row in rows]))
+        else:
+            predictions, proba = compiled.predict_frame(pd.DataFrame.from_records(rows))
+        response = {'predictions': predictions.tolist()}
+        if proba is not None:
+            response.update(classes=compiled.classes, probabilities=proba.round(6).tolist())
+        self._send_json(200, response)
+        return len(rows)
+
+    def _predict_arrow(self, body):
+        if not app.HAS_PYARROW:
+            raise ValueError("Arrow requests need pyarrow installed")
+        pa = app.pa
+        frame = pa.ipc.open_stream(body).read_pandas()
+        compiled = self.server.compiled
+        predictions, proba = compiled.predict_frame(frame)
+        columns = {'prediction': predictions.tolist()}
+        if proba is not None:
+            columns.update({f"probability_{label}": proba[:, i] for i, label in enumerate(compiled.classes)})
+        table = pa.table(columns)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        self._send(200, sink.getvalue().to_pybytes(), ARROW_STREAM)
+        return len(frame)
+
+
+class PredictionServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, compiled, max_rows=MAX_BATCH_ROWS, max_wait=MAX_WAIT_MS / 1000):
+        super().__init__(address, PredictionHandler)
+        self.compiled = compiled
+        self.stats = LatencyStats()
+        self.batcher = MicroBatcher(compiled, self.stats, max_rows, max_wait)
+
+
+def load_compiled_model(name, version=None):
+    """Load a registered model (latest version by default) and compile it for serving"""
+    registry = app.ModelRegistry(app.MODEL_REGISTRY_DIR)
+    name = registry.slug(name)
+    versions = registry.versions(name)
+    if not versions:
+        raise SystemExit(f"No registered model named {name!r} in {registry.root}")
+    return CompiledModel(*registry.load(name, version or versions[-1]))
+
+# ═══════════════════════════════════════════════════════════════════════════
+# 🚀 ENTRY POINT
+# ═══════════════════════════════════════════════════════════════════════════
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a registered NovaCore model over local HTTP")
+    parser.add_argument('--model', help="registered model name")
+    parser.add_argument('--version', type=int, help="model version (default: latest)")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch', type=int, default=MAX_BATCH_ROWS,
+                        help="most single-row requests scored by one model call")
+    parser.add_argument('--max-wait-ms', type=float, default=MAX_WAIT_MS,
+                        help="how long an open micro-batch waits for more rows")
+    parser.add_argument('--list', action='store_true', help="list registered models and exit")
+    args = parser.parse_args(argv)
+    
+    if args.list:
+        for manifest in app.ModelRegistry(app.MODEL_REGISTRY_DIR).manifests():
+            print(f"{manifest['name']}  v{manifest['version']}  {manifest['model_type']}  {manifest['created']}")
+        return
+    if not args.model:
+        parser.error("--model is required (see --list)")
+    
+    compiled = load_compiled_model(args.model, args.version)
+    # Small batches lose more to OpenMP/BLAS thread start-up than they gain
+    threadpool_limits(limits=1)
+    compiled.predict(compiled.encode_row(compiled.example_row())[None, :])
+    
+    server = PredictionServer((args.host, args.port), compiled, args.max_batch, args.max_wait_ms / 1000)
+    manifest = compiled.manifest
+    print(f"⚡ Serving {manifest['name']} v{manifest['version']} ({manifest['model_type']}) "
+          f"on http://{args.host}:{args.port}/predict")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
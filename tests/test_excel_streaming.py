@@ -0,0 +1,42 @@
+"""The streamed Excel preview must report the same rows as a full ``pd.read_excel`` load"""
+import io
+import os
+import sys
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import app  # noqa: E402
+
+
+def _workbook_bytes(rows):
+    workbook = Workbook()
+    sheet = workbook.active
+    for row in rows:
+        sheet.append(row)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('chunk_rows', [1, 2, 1000])
+def test_streamed_rows_match_read_excel_with_interior_blank_rows(chunk_rows):
+    data = _workbook_bytes([
+        ['id', 'city', 'score'],
+        [1, 'Cairo', 0.5],
+        [None, None, None],
+        [None, None, None],
+        [2, None, 0.7],
+        [None, None, None],
+        [3, 'Giza', None],
+        [None, None, None],
+    ])
+    full = pd.read_excel(io.BytesIO(data), engine='openpyxl')
+    streamed = pd.concat([chunk for chunk, _ in app.stream_excel_chunks(data, chunk_rows=chunk_rows)],
+                         ignore_index=True)
+    
+    assert len(streamed) == len(full)
+    assert list(streamed.columns) == list(full.columns)
+    assert streamed.isna().sum().to_dict() == full.isna().sum().to_dict()